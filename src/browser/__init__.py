@@ -2,7 +2,6 @@
 
 from src.browser.manager import BrowserManager
 from src.browser.stealth import StealthConfig, XvfbManager, detect_display, setup_xvfb_env
-from src.browser.captcha import CaptchaSolver, MouseController, solve_captcha
 
 __all__ = [
     "BrowserManager",
@@ -14,3 +13,15 @@ __all__ = [
     "setup_xvfb_env",
     "solve_captcha",
 ]
+
+# The CAPTCHA helpers pull in OpenCV, NumPy and PyAutoGUI, so they are imported on
+# first access rather than with the package
+_CAPTCHA_EXPORTS = ("CaptchaSolver", "MouseController", "solve_captcha")
+
+
+def __getattr__(name):
+    if name in _CAPTCHA_EXPORTS:
+        from src.browser import captcha
+
+        return getattr(captcha, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -17,6 +17,9 @@ from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Generator for mouse-path noise; avoids the legacy global RandomState on every path
+_RNG = np.random.default_rng()
+
 # Try to import pyautogui, handle gracefully if no display available
 pyautogui = None
 pyautogui_available = False
@@ -52,40 +55,53 @@ def _init_pyautogui():
 _init_pyautogui()
 
 
+def _drop_redundant_substrings(patterns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Drop patterns that contain another pattern, keeping order.
+
+    For an "any pattern occurs" scan these can never change the result, since the
+    shorter pattern they contain is found first.
+    """
+    return tuple(
+        pattern
+        for pattern in patterns
+        if not any(other != pattern and other in pattern for other in patterns)
+    )
+
+
 class CaptchaSolver:
     """CAPTCHA detection and solving with human-like interactions."""
 
     # CAPTCHA detection selectors
     CAPTCHA_SELECTORS = {
-        "cloudflare_turnstile": [
+        "cloudflare_turnstile": (
             'iframe[src*="challenges.cloudflare.com"]',
             ".cf-turnstile",
             "[data-cf-turnstile]",
             'input[name="cf-turnstile-response"]',
-        ],
-        "hcaptcha": [
+        ),
+        "hcaptcha": (
             ".h-captcha",
             "[data-hcaptcha-widget-id]",
             'iframe[src*="hcaptcha.com"]',
-        ],
-        "recaptcha": [
+        ),
+        "recaptcha": (
             ".g-recaptcha",
             "[data-sitekey]",
             'iframe[src*="google.com/recaptcha"]',
             'iframe[src*="recaptcha.net"]',
-        ],
-        "slider": [
+        ),
+        "slider": (
             'button:has-text("Drag the slider")',
             'button:has-text("slider")',
             '[role="button"]:has-text("Drag")',
             'input[type="range"]',
             '.slider-captcha',
             '[class*="slider"]',
-        ],
+        ),
     }
 
     # CAPTCHA challenge indicators
-    CHALLENGE_INDICATORS = [
+    CHALLENGE_INDICATORS = (
         "challenge",
         "captcha",
         "verification",
@@ -98,7 +114,49 @@ class CaptchaSolver:
         "drag the slider",
         "confirm you're not a robot",
         "slide to verify",
-    ]
+    )
+
+    # Lowercased indicators for the page-content scan, minus entries already covered by
+    # a shorter one (e.g. "please verify" by "verify")
+    _INDICATOR_SCAN = _drop_redundant_substrings(
+        tuple(indicator.lower() for indicator in CHALLENGE_INDICATORS)
+    )
+
+    # (captcha_type, selector list) pairs in priority order: each type's selectors are
+    # joined into one comma-separated list so detection sends one query per type
+    _SELECTOR_PROBES = tuple(
+        (captcha_type, ", ".join(selectors))
+        for captcha_type, selectors in CAPTCHA_SELECTORS.items()
+    )
+    _TYPE_SELECTORS = dict(_SELECTOR_PROBES)
+
+    # Page-content markers that identify a CAPTCHA provider outright, in priority order
+    DOMAIN_PATTERNS = {
+        "cloudflare_turnstile": ("challenges.cloudflare.com", "turnstile"),
+        "hcaptcha": ("hcaptcha.com", "h-captcha", "hcaptcha"),
+        "recaptcha": ("recaptcha.net", "google.com/recaptcha", "g-recaptcha"),
+    }
+
+    # Spellings of each CAPTCHA type name to look for next to a challenge indicator,
+    # e.g. hcaptcha, h-captcha, h_captcha; built once from CAPTCHA_SELECTORS
+    _TYPE_VARIANTS = tuple(
+        (
+            captcha_type,
+            tuple(
+                dict.fromkeys(
+                    (captcha_type.replace("_", ""), captcha_type.replace("_", "-"), captcha_type)
+                )
+            ),
+        )
+        for captcha_type in CAPTCHA_SELECTORS
+    )
+
+    # Smallest template side (in pixels) kept when building the coarse pyramid level
+    # for template matching; smaller templates are matched at full resolution only
+    PYRAMID_MIN_TEMPLATE_SIZE = 16
+
+    # Upper bound (seconds) for the backoff between checks in wait_for_captcha_resolution
+    MAX_RESOLUTION_CHECK_INTERVAL = 1.0
 
     def __init__(self, templates_dir: Optional[str] = None):
         """Initialize CAPTCHA solver.
@@ -149,16 +207,17 @@ class CaptchaSolver:
         Returns:
             Tuple of (detected: bool, captcha_type: Optional[str])
         """
-        # Check for CAPTCHA selectors
-        for captcha_type, selectors in self.CAPTCHA_SELECTORS.items():
-            for selector in selectors:
-                try:
-                    element = await page.query_selector(selector)
-                    if element:
-                        logger.info(f"Detected {captcha_type} CAPTCHA")
-                        return True, captcha_type
-                except Exception:
-                    continue
+        # Check for CAPTCHA selectors. The per-type probes are sent at once so detection
+        # costs one browser round-trip; the first hit in CAPTCHA_SELECTORS order still
+        # decides the type
+        elements = await asyncio.gather(
+            *(page.query_selector(selector) for _, selector in self._SELECTOR_PROBES),
+            return_exceptions=True,
+        )
+        for (captcha_type, _), element in zip(self._SELECTOR_PROBES, elements):
+            if element and not isinstance(element, Exception):
+                logger.info(f"Detected {captcha_type} CAPTCHA")
+                return True, captcha_type
 
         # Check page content for challenge indicators
         try:
@@ -166,31 +225,18 @@ class CaptchaSolver:
             content_lower = content.lower()
 
             # First check for domain-based detection
-            domain_patterns = {
-                "cloudflare_turnstile": ["challenges.cloudflare.com", "turnstile"],
-                "hcaptcha": ["hcaptcha.com", "h-captcha", "hcaptcha"],
-                "recaptcha": ["recaptcha.net", "google.com/recaptcha", "g-recaptcha"],
-            }
-
-            for captcha_type, patterns in domain_patterns.items():
+            for captcha_type, patterns in self.DOMAIN_PATTERNS.items():
                 if any(pattern in content_lower for pattern in patterns):
                     logger.info(f"Detected {captcha_type} via domain/content analysis")
                     return True, captcha_type
 
-            # Check for challenge indicators with CAPTCHA context
-            for indicator in self.CHALLENGE_INDICATORS:
-                if indicator in content_lower:
-                    # Check if it's in a CAPTCHA context
-                    for captcha_type in self.CAPTCHA_SELECTORS.keys():
-                        # Check for variations: hcaptcha, h-captcha, h_captcha
-                        type_variants = [
-                            captcha_type.replace("_", ""),  # hcaptcha
-                            captcha_type.replace("_", "-"),  # h-captcha
-                            captcha_type,  # h_captcha
-                        ]
-                        if any(variant in content_lower for variant in type_variants):
-                            logger.info(f"Detected {captcha_type} via content analysis")
-                            return True, captcha_type
+            # Check for challenge indicators with CAPTCHA context. The context check does
+            # not depend on which indicator matched, so it runs at most once
+            if any(indicator in content_lower for indicator in self._INDICATOR_SCAN):
+                for captcha_type, type_variants in self._TYPE_VARIANTS:
+                    if any(variant in content_lower for variant in type_variants):
+                        logger.info(f"Detected {captcha_type} via content analysis")
+                        return True, captcha_type
         except Exception as e:
             logger.debug(f"Error checking page content: {e}")
 
@@ -421,8 +467,8 @@ class CaptchaSolver:
                 await self._human_click(start_x, start_y)
                 await asyncio.sleep(0.2)
 
-                # Perform drag operation
-                pyautogui.mouseDown()
+                # Perform drag operation (pyautogui blocks, so it runs off the event loop)
+                await asyncio.to_thread(pyautogui.mouseDown)
                 await asyncio.sleep(0.1)
 
                 # Generate human-like drag path
@@ -433,10 +479,10 @@ class CaptchaSolver:
                 )
 
                 for point in path:
-                    pyautogui.moveTo(point[0], point[1])
+                    await asyncio.to_thread(pyautogui.moveTo, point[0], point[1])
                     await asyncio.sleep(random.uniform(0.01, 0.03))
 
-                pyautogui.mouseUp()
+                await asyncio.to_thread(pyautogui.mouseUp)
                 logger.info("Slider drag completed")
             else:
                 # Fallback: Use Playwright's drag simulation
@@ -479,11 +525,10 @@ class CaptchaSolver:
         logger.info("Attempting generic CAPTCHA solving")
 
         # Take screenshot and look for known templates
-        screenshot_path = "/tmp/captcha_screenshot.png"
-        await page.screenshot(path=screenshot_path)
+        screenshot_bytes = await page.screenshot()
 
         try:
-            screenshot = cv2.imread(screenshot_path, cv2.IMREAD_GRAYSCALE)
+            screenshot = self._decode_screenshot(screenshot_bytes)
             if screenshot is None:
                 logger.warning("Could not load screenshot for template matching")
                 return False
@@ -525,21 +570,28 @@ class CaptchaSolver:
         """
         try:
             # Check if images are constant (all same pixel value)
-            # Constant images can produce false matches with 1.0 confidence
-            screenshot_std = np.std(screenshot)
-            template_std = np.std(template)
+            # Constant images can produce false matches with 1.0 confidence.
+            # cv2.meanStdDev works on the uint8 data directly, where np.std would
+            # first upcast a full-screen screenshot to float64
+            screenshot_std = cv2.meanStdDev(screenshot)[1].max()
+            template_std = cv2.meanStdDev(template)[1].max()
 
             if screenshot_std < 1e-6 or template_std < 1e-6:
                 # One or both images are effectively constant
                 logger.debug("Rejecting match: constant image detected")
                 return None
 
-            result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+            # Coarse-to-fine: only the window around the downsampled best match is
+            # searched at full resolution (the whole screenshot for small templates)
+            offset_x, offset_y, window = self._coarse_search_window(screenshot, template)
+
+            result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
             min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
 
             if max_val >= threshold:
                 # Get center of matched region
                 h, w = template.shape[:2]
+                max_loc = (max_loc[0] + offset_x, max_loc[1] + offset_y)
                 center_x = max_loc[0] + w // 2
                 center_y = max_loc[1] + h // 2
                 return (center_x, center_y, max_val)
@@ -549,6 +601,64 @@ class CaptchaSolver:
 
         return None
 
+    @staticmethod
+    def _decode_screenshot(image_bytes: bytes) -> Optional[np.ndarray]:
+        """Decode PNG screenshot bytes straight into a grayscale array.
+
+        Decoding in memory avoids a round-trip through a temp file, and keeps concurrent
+        solves from overwriting each other's screenshot on disk.
+
+        Args:
+            image_bytes: Encoded image as returned by page.screenshot()
+
+        Returns:
+            Grayscale image as numpy array, or None if it could not be decoded
+        """
+        if not image_bytes:
+            return None
+        return cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+
+    def _coarse_search_window(
+        self, screenshot: np.ndarray, template: np.ndarray
+    ) -> Tuple[int, int, np.ndarray]:
+        """Narrow the full-resolution search area using an image pyramid.
+
+        Both images are halved with cv2.pyrDown while the template stays at least
+        PYRAMID_MIN_TEMPLATE_SIZE pixels on its short side, and the template is
+        located at that level. Each level cuts the coarse matching work by 4x.
+
+        Args:
+            screenshot: Screenshot as numpy array
+            template: Template image to match
+
+        Returns:
+            Tuple of (x_offset, y_offset, window) where window is the screenshot region
+            to search at full resolution
+        """
+        h, w = template.shape[:2]
+        levels = 0
+        while min(h, w) >> (levels + 1) >= self.PYRAMID_MIN_TEMPLATE_SIZE:
+            levels += 1
+        if levels == 0:
+            return 0, 0, screenshot
+
+        small_screenshot, small_template = screenshot, template
+        for _ in range(levels):
+            small_screenshot = cv2.pyrDown(small_screenshot)
+            small_template = cv2.pyrDown(small_template)
+
+        coarse = cv2.matchTemplate(small_screenshot, small_template, cv2.TM_CCOEFF_NORMED)
+        _, _, _, coarse_loc = cv2.minMaxLoc(coarse)
+
+        # Map back to full resolution, padded by two coarse pixels to absorb rounding
+        scale = 1 << levels
+        pad = 2 * scale
+        x0 = max(coarse_loc[0] * scale - pad, 0)
+        y0 = max(coarse_loc[1] * scale - pad, 0)
+        x1 = min(coarse_loc[0] * scale + w + pad, screenshot.shape[1])
+        y1 = min(coarse_loc[1] * scale + h + pad, screenshot.shape[0])
+        return x0, y0, screenshot[y0:y1, x0:x1]
+
     async def _template_click(self, page, iframe_box: Dict[str, float], template_name: str) -> bool:
         """Click using template matching within an iframe.
 
@@ -565,8 +675,6 @@ class CaptchaSolver:
             return False
 
         # Take screenshot of iframe region
-        screenshot_path = "/tmp/iframe_screenshot.png"
-
         try:
             # Calculate iframe region
             clip = {
@@ -575,9 +683,9 @@ class CaptchaSolver:
                 "width": iframe_box["width"],
                 "height": iframe_box["height"],
             }
-            await page.screenshot(path=screenshot_path, clip=clip)
+            screenshot_bytes = await page.screenshot(clip=clip)
 
-            screenshot = cv2.imread(screenshot_path, cv2.IMREAD_GRAYSCALE)
+            screenshot = self._decode_screenshot(screenshot_bytes)
             if screenshot is None:
                 return False
 
@@ -618,9 +726,12 @@ class CaptchaSolver:
         # Generate human-like path
         path = self._generate_mouse_path((current_x, current_y), (target_x, target_y))
 
-        # Move along path
+        # Move along path; pyautogui blocks (including its PAUSE), so each call runs in a
+        # worker thread to keep the event loop free
         for point in path:
-            pyautogui.moveTo(point[0], point[1], duration=random.uniform(0.001, 0.005))
+            await asyncio.to_thread(
+                pyautogui.moveTo, point[0], point[1], duration=random.uniform(0.001, 0.005)
+            )
             await asyncio.sleep(random.uniform(0.001, 0.01))
 
         # Small pause before click
@@ -629,7 +740,7 @@ class CaptchaSolver:
         # Click with slight randomization
         final_x = target_x + random.randint(-2, 2)
         final_y = target_y + random.randint(-2, 2)
-        pyautogui.click(final_x, final_y)
+        await asyncio.to_thread(pyautogui.click, final_x, final_y)
 
         logger.debug(f"Human-like click at ({final_x}, {final_y})")
 
@@ -654,21 +765,22 @@ class CaptchaSolver:
         mid_x = (start_x + end_x) / 2 + random.randint(-50, 50)
         mid_y = (start_y + end_y) / 2 + random.randint(-50, 50)
 
-        path = []
-        for i in range(steps):
-            t = i / (steps - 1)
-
-            # Quadratic Bezier curve
-            x = (1 - t) ** 2 * start_x + 2 * (1 - t) * t * mid_x + t**2 * end_x
-            y = (1 - t) ** 2 * start_y + 2 * (1 - t) * t * mid_y + t**2 * end_y
-
-            # Add small random noise
-            noise_x = random.randint(-3, 3) * (1 - t)  # Less noise near end
-            noise_y = random.randint(-3, 3) * (1 - t)
+        # Evaluate the quadratic Bezier curve for all steps at once
+        t = np.linspace(0.0, 1.0, steps)[:, None]
+        points = (
+            (1 - t) ** 2 * np.array([start_x, start_y], dtype=np.float64)
+            + 2 * (1 - t) * t * np.array([mid_x, mid_y], dtype=np.float64)
+            + t**2 * np.array([end_x, end_y], dtype=np.float64)
+        )
 
-            path.append((int(x + noise_x), int(y + noise_y)))
+        # Add small random noise, fading out towards the end
+        noise = _RNG.integers(-3, 4, size=(steps, 2))
+        if not noise[0].any():
+            # Never start exactly on the cursor position
+            noise[0] = _RNG.choice((-1, 1), size=2)
+        points += noise * (1 - t)
 
-        return path
+        return list(map(tuple, points.astype(int).tolist()))
 
     async def wait_for_captcha_resolution(
         self, page, check_interval: float = 0.5, timeout: int = 30
@@ -677,24 +789,58 @@ class CaptchaSolver:
 
         Args:
             page: Playwright page object
-            check_interval: How often to check (seconds)
+            check_interval: Initial delay between checks (seconds); doubles after each
+                check that still finds a CAPTCHA, up to MAX_RESOLUTION_CHECK_INTERVAL
             timeout: Maximum wait time
 
         Returns:
             True if CAPTCHA was resolved
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        interval = check_interval
 
-        while time.time() - start_time < timeout:
+        while True:
             detected, captcha_type = await self.detect_captcha(page)
             if not detected:
                 logger.info("CAPTCHA resolved")
                 return True
-            await asyncio.sleep(check_interval)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            # While the widget is in the DOM, let the browser signal its removal
+            # instead of polling; content-only detections fall back to polling
+            selector = self._TYPE_SELECTORS.get(captcha_type)
+            if selector and await self._wait_for_detach(page, selector, remaining):
+                continue
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, max(check_interval, self.MAX_RESOLUTION_CHECK_INTERVAL))
 
         logger.warning(f"CAPTCHA still present after {timeout}s")
         return False
 
+    async def _wait_for_detach(self, page, selector: str, timeout: float) -> bool:
+        """Wait for the element matched by a CAPTCHA selector to leave the DOM.
+
+        Args:
+            page: Playwright page object
+            selector: Selector list for one CAPTCHA type
+            timeout: Maximum wait time (seconds)
+
+        Returns:
+            True if the element was present and has detached, False otherwise
+        """
+        try:
+            if not await page.query_selector(selector):
+                return False
+            await page.wait_for_selector(selector, state="detached", timeout=timeout * 1000)
+            return True
+        except Exception as e:
+            logger.debug(f"Stopped waiting for CAPTCHA element to detach: {e}")
+            return False
+
 
 class MouseController:
     """Human-like mouse controller with PyAutoGUI."""
@@ -726,7 +872,8 @@ class MouseController:
             distance = ((x - current_x) ** 2 + (y - current_y) ** 2) ** 0.5
             duration = min(0.5, max(0.1, distance / 2000))  # 0.1-0.5s
 
-        pyautogui.moveTo(x, y, duration=duration)
+        # moveTo blocks for the whole duration, so run it off the event loop
+        await asyncio.to_thread(pyautogui.moveTo, x, y, duration=duration)
         await asyncio.sleep(random.uniform(0.01, 0.05))
 
     async def click(self, x: Optional[int] = None, y: Optional[int] = None):
@@ -745,7 +892,7 @@ class MouseController:
 
         # Randomize click timing
         await asyncio.sleep(random.uniform(0.05, 0.15))
-        pyautogui.click()
+        await asyncio.to_thread(pyautogui.click)
         await asyncio.sleep(random.uniform(0.01, 0.05))
 
     async def scroll(self, amount: int):
@@ -758,12 +905,15 @@ class MouseController:
             logger.warning("PyAutoGUI not available, skipping scroll")
             return
 
-        # Break into smaller scrolls
-        steps = abs(amount) // 50 + 1
-        step_amount = amount // steps
+        # Break into a few uneven scrolls (at most 5) that add up to the exact amount
+        chunks = max(1, min(5, abs(amount) // 100))
+        weights = [random.triangular(0.5, 1.5) for _ in range(chunks)]
+        total_weight = sum(weights)
+        chunk_amounts = [int(amount * weight / total_weight) for weight in weights]
+        chunk_amounts[-1] += amount - sum(chunk_amounts)
 
-        for _ in range(steps):
-            pyautogui.scroll(step_amount)
+        for chunk_amount in chunk_amounts:
+            await asyncio.to_thread(pyautogui.scroll, chunk_amount)
             await asyncio.sleep(random.uniform(0.05, 0.15))
 
     async def drag_to(self, start_x: int, start_y: int, end_x: int, end_y: int):
@@ -780,17 +930,33 @@ class MouseController:
             return
 
         await self.move_to(start_x, start_y)
-        pyautogui.mouseDown()  # type: ignore
+        await asyncio.to_thread(pyautogui.mouseDown)  # type: ignore
 
         # Generate path for drag
-        solver = CaptchaSolver()
-        path = solver._generate_mouse_path((start_x, start_y), (end_x, end_y), steps=20)
+        path = _get_default_solver()._generate_mouse_path(
+            (start_x, start_y), (end_x, end_y), steps=20
+        )
 
         for point in path:
-            pyautogui.moveTo(point[0], point[1])  # type: ignore
+            await asyncio.to_thread(pyautogui.moveTo, point[0], point[1])  # type: ignore
             await asyncio.sleep(random.uniform(0.01, 0.02))
 
-        pyautogui.mouseUp()  # type: ignore
+        await asyncio.to_thread(pyautogui.mouseUp)  # type: ignore
+
+
+# Shared solver for solve_captcha() and drag paths using the default templates directory
+_default_solver: Optional[CaptchaSolver] = None
+
+
+def _get_default_solver() -> CaptchaSolver:
+    """Return the shared solver, creating it on first use.
+
+    Reusing one solver means templates are read from disk only once per process.
+    """
+    global _default_solver
+    if _default_solver is None:
+        _default_solver = CaptchaSolver()
+    return _default_solver
 
 
 # Convenience function for simple CAPTCHA solving
@@ -807,5 +973,8 @@ async def solve_captcha(
     Returns:
         Dictionary with solving results
     """
-    solver = CaptchaSolver(templates_dir=templates_dir)
+    if templates_dir is None:
+        solver = _get_default_solver()
+    else:
+        solver = CaptchaSolver(templates_dir=templates_dir)
     return await solver.solve(page, timeout=timeout)
@@ -17,7 +17,7 @@ from patchright.async_api import Browser, BrowserContext, Page
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TabInfo:
     """Information about a browser tab."""
 
@@ -51,7 +51,8 @@ class BrowserInstance:
         self.browser = browser
         self.context = context
         self.tabs: OrderedDict[str, TabInfo] = OrderedDict()
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()  # Monotonic clock; immune to wall-clock jumps
+        self.last_activity_at = time.time()  # Wall-clock time of the same event, for reporting
         self.is_active = True
         self._lock = asyncio.Lock()
         self._closed = False
@@ -60,7 +61,8 @@ class BrowserInstance:
 
     def update_activity(self):
         """Update the last activity timestamp."""
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
+        self.last_activity_at = time.time()
         self.is_active = True
 
     async def create_tab(
@@ -80,7 +82,7 @@ class BrowserInstance:
                 raise RuntimeError("Browser instance has been closed")
 
             # Evict tabs if at limit
-            if len(self.tabs) >= self.MAX_TABS:
+            while self.tabs and len(self.tabs) >= self.MAX_TABS:
                 await self._evict_oldest_tab()
 
             # Generate tab ID if not provided
@@ -181,9 +183,8 @@ class BrowserInstance:
         if not self.tabs:
             return
 
-        # Get the oldest tab (first in OrderedDict)
-        oldest_id = next(iter(self.tabs))
-        oldest_tab = self.tabs.pop(oldest_id)
+        # Pop the oldest tab (first in OrderedDict) in O(1)
+        oldest_id, oldest_tab = self.tabs.popitem(last=False)
 
         try:
             await oldest_tab.page.close()
@@ -194,13 +195,20 @@ class BrowserInstance:
     async def close_all_tabs(self):
         """Close all tabs except the browser itself."""
         async with self._lock:
-            for tab_id, tab_info in list(self.tabs.items()):
-                try:
-                    await tab_info.page.close()
-                except Exception as e:
-                    logger.debug(f"Error closing tab {tab_id}: {e}")
-            self.tabs.clear()
-            self.update_activity()
+            await self._close_all_tabs()
+
+    async def _close_all_tabs(self):
+        """Close all tabs.
+
+        Must be called with _lock held.
+        """
+        for tab_id, tab_info in list(self.tabs.items()):
+            try:
+                await tab_info.page.close()
+            except Exception as e:
+                logger.debug(f"Error closing tab {tab_id}: {e}")
+        self.tabs.clear()
+        self.update_activity()
 
     async def close(self):
         """Close the browser instance and all tabs."""
@@ -211,8 +219,8 @@ class BrowserInstance:
             self._closed = True
             self.is_active = False
 
-            # Close all tabs
-            await self.close_all_tabs()
+            # Close all tabs (lock already held)
+            await self._close_all_tabs()
 
             # Close context
             try:
@@ -241,7 +249,7 @@ class BrowserInstance:
         Returns:
             True if idle for longer than timeout
         """
-        return (time.time() - self.last_activity) > timeout_seconds
+        return (time.monotonic() - self.last_activity) > timeout_seconds
 
     def get_stats(self) -> dict:
         """Get statistics about this browser instance.
@@ -254,7 +262,7 @@ class BrowserInstance:
             "tab_count": self.tab_count,
             "max_tabs": self.MAX_TABS,
             "is_active": self.is_active,
-            "last_activity": self.last_activity,
-            "idle_seconds": time.time() - self.last_activity,
+            "last_activity": self.last_activity_at,
+            "idle_seconds": time.monotonic() - self.last_activity,
             "closed": self._closed,
         }
@@ -6,10 +6,12 @@ to prevent data leakage and resource conflicts.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
 import uuid
 import time
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
 from patchright.async_api import async_playwright, Browser, BrowserContext
@@ -33,13 +35,21 @@ class SubAgentBrowserManager:
     # Cleanup configuration
     CLEANUP_INTERVAL_SECONDS = 60  # Check for inactive sessions every minute
     IDLE_TIMEOUT_SECONDS = 300  # Close sessions idle for 5 minutes (default)
+    BROWSER_POOL_SIZE = 2  # Warm browser processes kept for reuse by new sessions
 
     def __init__(self, idle_timeout_minutes: int = 30):
         # Dictionary to track all sub-agent browsers
         self._browsers: Dict[str, BrowserInstance] = {}
         self._browser_refs: Dict[str, Browser] = {}  # Browser references for cleanup
+        self._browser_pool: List[Browser] = []  # Released browsers awaiting a new session
         self._playwright = None
 
+        # Min-heap of (idle deadline, sequence, session_id, instance); entries whose
+        # instance is no longer the live one for that session are dropped lazily. The
+        # sequence number breaks deadline ties so instances are never compared
+        self._expiry_heap: List[Tuple[float, int, str, BrowserInstance]] = []
+        self._expiry_seq = itertools.count()
+
         # Thread safety
         self._lock = asyncio.Lock()
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -96,14 +106,16 @@ class SubAgentBrowserManager:
                     logger.warning(f"Error closing browser instance {session_id}: {e}")
 
             self._browsers.clear()
+            self._expiry_heap.clear()
 
-            # Close all browser references
-            for browser in self._browser_refs.values():
+            # Close all browser references, including pooled ones
+            for browser in [*self._browser_refs.values(), *self._browser_pool]:
                 try:
                     await browser.close()
                 except Exception as e:
                     logger.debug(f"Error closing browser: {e}")
             self._browser_refs.clear()
+            self._browser_pool.clear()
 
             # Stop playwright
             if self._playwright:
@@ -142,35 +154,18 @@ class SubAgentBrowserManager:
             logger.info(f"Creating new browser instance for session {session_id}")
 
             try:
-                # Launch browser process
-                launch_args = self.stealth_config.get_launch_args()
-
-                try:
-                    browser = await self._playwright.chromium.launch(
-                        channel=self.stealth_config.channel,
-                        headless=self.stealth_config.headless,
-                        args=launch_args,
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to launch with channel {self.stealth_config.channel}: {e}")
-                    logger.info("Falling back to default Chromium...")
-                    browser = await self._playwright.chromium.launch(
-                        headless=self.stealth_config.headless,
-                        args=launch_args,
-                    )
+                # Reuse a pooled browser process when available; the context is always fresh
+                browser, context = await self._acquire_browser()
 
                 # Store browser reference for cleanup
                 self._browser_refs[session_id] = browser
 
-                # Create isolated context
-                context_options = self.stealth_config.get_context_options()
-                context = await browser.new_context(**context_options)
-
                 # Create browser instance
                 instance = BrowserInstance(session_id=session_id, browser=browser, context=context)
 
                 # Store instance
                 self._browsers[session_id] = instance
+                self._schedule_expiry(session_id, instance)
 
                 logger.info(f"Browser instance created for session {session_id}")
                 return instance
@@ -179,6 +174,76 @@ class SubAgentBrowserManager:
                 logger.error(f"Failed to create browser for session {session_id}: {e}")
                 raise
 
+    async def _launch_browser(self) -> Browser:
+        """Launch a new browser process, falling back to default Chromium.
+
+        Returns:
+            The launched Browser
+        """
+        launch_args = self.stealth_config.get_launch_args()
+
+        try:
+            return await self._playwright.chromium.launch(
+                channel=self.stealth_config.channel,
+                headless=self.stealth_config.headless,
+                args=launch_args,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to launch with channel {self.stealth_config.channel}: {e}")
+            logger.info("Falling back to default Chromium...")
+            return await self._playwright.chromium.launch(
+                headless=self.stealth_config.headless,
+                args=launch_args,
+            )
+
+    async def _acquire_browser(self) -> Tuple[Browser, BrowserContext]:
+        """Get a browser with a new isolated context, preferring a pooled browser.
+
+        Must be called with _lock held.
+
+        Returns:
+            Tuple of (browser, context)
+        """
+        context_options = self.stealth_config.get_context_options()
+
+        while self._browser_pool:
+            browser = self._browser_pool.pop()
+            try:
+                context = await browser.new_context(**context_options)
+                logger.debug("Reusing pooled browser process")
+                return browser, context
+            except Exception as e:
+                logger.debug(f"Discarding unusable pooled browser: {e}")
+                await self._close_browser_ref(browser)
+
+        browser = await self._launch_browser()
+        try:
+            context = await browser.new_context(**context_options)
+        except Exception:
+            await self._close_browser_ref(browser)
+            raise
+        return browser, context
+
+    async def _release_browser(self, browser: Browser):
+        """Return a browser to the pool, or close it if the pool is full.
+
+        The session's context must already be closed. Must be called with _lock held.
+
+        Args:
+            browser: Browser whose session has ended
+        """
+        if self._running and len(self._browser_pool) < self.BROWSER_POOL_SIZE:
+            self._browser_pool.append(browser)
+        else:
+            await self._close_browser_ref(browser)
+
+    async def _close_browser_ref(self, browser: Browser):
+        """Close a browser process, ignoring errors."""
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+
     async def get_browser(self, session_id: str) -> Optional[BrowserInstance]:
         """Get an existing browser instance by session ID.
 
@@ -213,13 +278,10 @@ class SubAgentBrowserManager:
                 except Exception as e:
                     logger.warning(f"Error closing browser instance {session_id}: {e}")
 
-                # Also close the browser reference
+                # Keep the browser process warm for the next session
                 browser = self._browser_refs.pop(session_id, None)
                 if browser:
-                    try:
-                        await browser.close()
-                    except Exception as e:
-                        logger.debug(f"Error closing browser: {e}")
+                    await self._release_browser(browser)
 
                 return True
             return False
@@ -243,7 +305,7 @@ class SubAgentBrowserManager:
 
         while self._running:
             try:
-                await asyncio.sleep(self.CLEANUP_INTERVAL_SECONDS)
+                await asyncio.sleep(self._next_cleanup_delay())
 
                 if not self._running:
                     break
@@ -256,19 +318,54 @@ class SubAgentBrowserManager:
             except Exception as e:
                 logger.error(f"Error in cleanup task: {e}")
 
+    def _schedule_expiry(self, session_id: str, instance: BrowserInstance):
+        """Push the idle deadline for a session's instance onto the expiry heap.
+
+        Must be called with _lock held.
+        """
+        heapq.heappush(
+            self._expiry_heap,
+            (
+                instance.last_activity + self.IDLE_TIMEOUT_SECONDS,
+                next(self._expiry_seq),
+                session_id,
+                instance,
+            ),
+        )
+
+    def _next_cleanup_delay(self) -> float:
+        """Get seconds until the earliest idle deadline (capped at the cleanup interval)."""
+        if not self._expiry_heap:
+            return self.CLEANUP_INTERVAL_SECONDS
+        delay = self._expiry_heap[0][0] - time.monotonic()
+        return min(max(delay, 0.0), self.CLEANUP_INTERVAL_SECONDS)
+
     async def _cleanup_inactive(self):
-        """Clean up browser instances that have been idle too long."""
+        """Clean up browser instances that have been idle too long.
+
+        Only sessions whose scheduled deadline has passed are inspected. A session
+        that was active since its deadline was scheduled is re-armed instead of closed.
+        """
         async with self._lock:
-            current_time = time.time()
+            current_time = time.monotonic()  # One snapshot per pass
             to_close = []
 
-            for session_id, instance in self._browsers.items():
+            while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+                _, _, session_id, scheduled = heapq.heappop(self._expiry_heap)
+                instance = self._browsers.get(session_id)
+                if instance is not scheduled or session_id in to_close:
+                    # Session closed, or closed and re-created with a new instance
+                    # that has its own entry
+                    continue
+
+                deadline = instance.last_activity + self.IDLE_TIMEOUT_SECONDS
+                if deadline > current_time:
+                    self._schedule_expiry(session_id, instance)
+                    continue
+
                 idle_time = current_time - instance.last_activity
-                if idle_time > self.IDLE_TIMEOUT_SECONDS:
-                    to_close.append(session_id)
-                    logger.info(
-                        f"Session {session_id} idle for {idle_time:.0f}s, marking for cleanup"
-                    )
+                to_close.append(session_id)
+                logger.info(f"Session {session_id} idle for {idle_time:.0f}s, marking for cleanup")
 
             # Close marked sessions
             for session_id in to_close:
@@ -324,6 +421,7 @@ class SubAgentBrowserManager:
         """
         return {
             "active_sessions": len(self._browsers),
+            "pooled_browsers": len(self._browser_pool),
             "running": self._running,
             "cleanup_interval": self.CLEANUP_INTERVAL_SECONDS,
             "idle_timeout": self.IDLE_TIMEOUT_SECONDS,
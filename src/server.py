@@ -9,19 +9,22 @@ import argparse
 import asyncio
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
 from src.browser.manager import BrowserManager
-from src.browser.captcha import CaptchaSolver
 from src.tools.navigation import NavigationTools
 from src.tools.interaction import InteractionTools
 from src.tools.extraction import ExtractionTools
 from src.tools.stealth_search import StealthSearchTools, SearchResult, ExtractedContent
 
+if TYPE_CHECKING:
+    # Imported on first CAPTCHA solve; it pulls in OpenCV, NumPy and PyAutoGUI
+    from src.browser.captcha import CaptchaSolver
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("stealth-browser-mcp")
 
@@ -39,6 +42,7 @@ class StealthBrowserServer:
         self.interact_tools: Optional[InteractionTools] = None
         self.extract_tools: Optional[ExtractionTools] = None
         self.stealth_search_tools: Optional[StealthSearchTools] = None
+        self.captcha_solver: Optional["CaptchaSolver"] = None
 
         self._setup_handlers()
 
@@ -244,6 +248,11 @@ class StealthBrowserServer:
                                 "default": 5000,
                                 "description": "Maximum content length in characters (default: 5000)",
                             },
+                            "use_cache": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Reuse a recent extraction of the same URL (default: true)",
+                            },
                             "session_id": {
                                 "type": "string",
                                 "description": "Optional: Sub-agent session ID for browser isolation",
@@ -253,6 +262,40 @@ class StealthBrowserServer:
                         "additionalProperties": False,
                     },
                 ),
+                Tool(
+                    name="stealth_extract_many",
+                    description="Extract clean, readable content from several URLs concurrently",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "urls": {
+                                "type": "array",
+                                "items": {"type": "string", "minLength": 1},
+                                "minItems": 1,
+                                "maxItems": 20,
+                                "description": "URLs to extract content from (max 20)",
+                            },
+                            "max_length": {
+                                "type": "integer",
+                                "default": 5000,
+                                "description": "Maximum content length per URL in characters (default: 5000)",
+                            },
+                            "concurrency": {
+                                "type": "integer",
+                                "default": 4,
+                                "minimum": 1,
+                                "maximum": 8,
+                                "description": "Maximum number of pages loaded at once (default: 4)",
+                            },
+                            "session_id": {
+                                "type": "string",
+                                "description": "Optional: Sub-agent session ID for browser isolation",
+                            },
+                        },
+                        "required": ["urls"],
+                        "additionalProperties": False,
+                    },
+                ),
                 Tool(
                     name="stealth_scrape",
                     description="Deep page scraper that fetches and extracts the full content of a URL in Markdown format",
@@ -294,7 +337,7 @@ class StealthBrowserServer:
 
         try:
             # Use isolated context for search/extract/scrape to prevent race conditions
-            if name in ("stealth_search", "stealth_extract", "stealth_scrape"):
+            if name in self._ISOLATED_TOOLS:
                 result = await self._execute_tool_isolated(name, arguments)
             else:
                 result = await self._execute_tool(name, arguments)
@@ -310,6 +353,12 @@ class StealthBrowserServer:
         - If session_id is provided, uses SubAgentBrowserManager
         - Otherwise uses shared browser with isolated context
         """
+        if name == "stealth_search":
+            # Reject bad input before acquiring a browser or context
+            StealthSearchTools.validate_search_params(
+                arguments.get("query"), arguments.get("count", 10), arguments.get("page", 1)
+            )
+
         session_id = arguments.get("session_id")
 
         if session_id and self.browser_manager.subagent_manager:
@@ -336,11 +385,21 @@ class StealthBrowserServer:
                     )
                     return self._format_search_response(response)
                 elif name == "stealth_extract":
-                    stealth_tools = StealthSearchTools(page)
+                    stealth_tools = StealthSearchTools(page, cache_scope=session_id)
                     content = await stealth_tools.extract(
-                        url=arguments["url"], max_length=arguments.get("max_length", 5000)
+                        url=arguments["url"],
+                        max_length=arguments.get("max_length", 5000),
+                        use_cache=arguments.get("use_cache", True),
                     )
                     return self._format_extract_response(content)
+                elif name == "stealth_extract_many":
+                    stealth_tools = StealthSearchTools(page, cache_scope=session_id)
+                    contents = await stealth_tools.extract_many(
+                        urls=arguments["urls"],
+                        max_length=arguments.get("max_length", 5000),
+                        concurrency=arguments.get("concurrency", 4),
+                    )
+                    return self._format_extract_many_response(arguments["urls"], contents)
                 elif name == "stealth_scrape":
                     stealth_tools = StealthSearchTools(page)
                     markdown = await stealth_tools.scrape_page(
@@ -364,9 +423,19 @@ class StealthBrowserServer:
                 elif name == "stealth_extract":
                     stealth_tools = StealthSearchTools(page)
                     content = await stealth_tools.extract(
-                        url=arguments["url"], max_length=arguments.get("max_length", 5000)
+                        url=arguments["url"],
+                        max_length=arguments.get("max_length", 5000),
+                        use_cache=arguments.get("use_cache", True),
                     )
                     return self._format_extract_response(content)
+                elif name == "stealth_extract_many":
+                    stealth_tools = StealthSearchTools(page)
+                    contents = await stealth_tools.extract_many(
+                        urls=arguments["urls"],
+                        max_length=arguments.get("max_length", 5000),
+                        concurrency=arguments.get("concurrency", 4),
+                    )
+                    return self._format_extract_many_response(arguments["urls"], contents)
                 elif name == "stealth_scrape":
                     stealth_tools = StealthSearchTools(page)
                     markdown = await stealth_tools.scrape_page(
@@ -405,15 +474,30 @@ class StealthBrowserServer:
 
     def _format_extract_response(self, content) -> str:
         """Format extracted content as readable text."""
-        result_text = f"Title: {content.title}\n"
-        result_text += f"URL: {content.url}\n"
-        result_text += f"Word Count: {content.word_count}\n\n"
+        # Collect the parts and join once so the (potentially large) content body is
+        # copied a single time
+        parts = [
+            f"Title: {content.title}\n",
+            f"URL: {content.url}\n",
+            f"Word Count: {content.word_count}\n\n",
+        ]
 
         if content.summary:
-            result_text += f"Summary:\n{content.summary}\n\n"
-
-        result_text += f"Content:\n{content.content}"
-        return result_text
+            parts.append(f"Summary:\n{content.summary}\n\n")
+
+        parts.append("Content:\n")
+        parts.append(content.content)
+        return "".join(parts)
+
+    def _format_extract_many_response(self, urls, contents) -> str:
+        """Format batch extraction results, one section per requested URL."""
+        sections = []
+        for url, content in zip(urls, contents):
+            if content is None:
+                sections.append(f"URL: {url}\nError: Failed to extract content")
+            else:
+                sections.append(self._format_extract_response(content))
+        return "\n\n---\n\n".join(sections)
 
     async def _execute_tool(self, name: str, arguments: dict) -> str:
         """Route tool call to appropriate handler (uses shared page for non-isolated tools)."""
@@ -422,73 +506,118 @@ class StealthBrowserServer:
         if not page:
             return "Error: Browser page not available"
 
-        # Navigation tools
-        if name == "browser_navigate":
-            await page.goto(arguments["url"], wait_until=arguments.get("wait_until", "load"))
-            return f"Navigated to {arguments['url']}"
-
-        elif name == "browser_back":
-            await page.go_back()
-            return "Navigated back"
-
-        # Interaction tools
-        elif name == "browser_click":
-            selector = arguments["selector"]
-            if not selector or not selector.strip():
-                raise ValueError("Selector cannot be empty")
-            await page.click(selector)
-            return f"Clicked element: {selector}"
-
-        elif name == "browser_fill":
-            selector = arguments["selector"]
-            if not selector or not selector.strip():
-                raise ValueError("Selector cannot be empty")
-            await page.fill(selector, arguments["value"])
-            return f"Filled {selector} with value"
-
-        elif name == "browser_hover":
-            selector = arguments["selector"]
-            if not selector or not selector.strip():
-                raise ValueError("Selector cannot be empty")
-            await page.hover(selector)
-            return f"Hovered over {selector}"
-
-        # Extraction tools
-        elif name == "browser_screenshot":
-            path = f"/tmp/{arguments['name']}.png"
-            if arguments.get("selector"):
-                element = await page.query_selector(arguments["selector"])
-                if element:
-                    await element.screenshot(path=path)
-                else:
-                    return f"Element not found: {arguments['selector']}"
-            else:
-                await page.screenshot(path=path, full_page=arguments.get("full_page", False))
-            return f"Screenshot saved: {path}"
-
-        elif name == "browser_evaluate":
-            result = await page.evaluate(arguments["script"])
-            return str(result)
-
-        elif name == "browser_solve_captcha":
-            timeout = arguments.get("timeout", 30)
-            captcha_solver = CaptchaSolver()
-            result = await captcha_solver.solve(page, timeout=timeout)
-            if result.get("success"):
-                return f"CAPTCHA solved successfully in {result.get('duration', 0):.2f}s"
-            else:
-                error_msg = result.get("error", "Unknown error")
-                return f"Failed to solve CAPTCHA: {error_msg}"
+        handler = self._TOOL_HANDLERS.get(name)
+        if handler is None:
+            return f"Unknown tool: {name}"
+        return await handler(self, page, arguments)
 
-        elif name == "stealth_scrape":
-            stealth_tools = StealthSearchTools(page)
-            markdown = await stealth_tools.scrape_page(
-                url=arguments["url"], include_images=arguments.get("include_images", False)
-            )
-            return markdown
+    @staticmethod
+    def _require_selector(arguments: dict) -> str:
+        """Get the selector argument, rejecting empty or whitespace-only values.
+
+        Args:
+            arguments: Tool arguments
 
+        Returns:
+            The selector
+
+        Raises:
+            ValueError: If the selector is missing or blank
+        """
+        selector = arguments.get("selector", "")
+        if not selector or not selector.strip():
+            raise ValueError("Selector cannot be empty")
+        return selector
+
+    # Navigation tools
+    async def _tool_browser_navigate(self, page, arguments: dict) -> str:
+        """Navigate the shared page to a URL."""
+        await page.goto(arguments["url"], wait_until=arguments.get("wait_until", "load"))
+        return f"Navigated to {arguments['url']}"
+
+    async def _tool_browser_back(self, page, arguments: dict) -> str:
+        """Navigate back in history."""
+        await page.go_back()
+        return "Navigated back"
+
+    # Interaction tools
+    async def _tool_browser_click(self, page, arguments: dict) -> str:
+        """Click an element."""
+        selector = self._require_selector(arguments)
+        await page.click(selector)
+        return f"Clicked element: {selector}"
+
+    async def _tool_browser_fill(self, page, arguments: dict) -> str:
+        """Fill an input element."""
+        selector = self._require_selector(arguments)
+        await page.fill(selector, arguments["value"])
+        return f"Filled {selector} with value"
+
+    async def _tool_browser_hover(self, page, arguments: dict) -> str:
+        """Hover over an element."""
+        selector = self._require_selector(arguments)
+        await page.hover(selector)
+        return f"Hovered over {selector}"
+
+    # Extraction tools
+    async def _tool_browser_screenshot(self, page, arguments: dict) -> str:
+        """Save a screenshot of the page or an element."""
+        path = f"/tmp/{arguments['name']}.png"
+        if arguments.get("selector"):
+            element = await page.query_selector(arguments["selector"])
+            if element:
+                await element.screenshot(path=path)
+            else:
+                return f"Element not found: {arguments['selector']}"
         else:
-            return f"Unknown tool: {name}"
+            await page.screenshot(path=path, full_page=arguments.get("full_page", False))
+        return f"Screenshot saved: {path}"
+
+    async def _tool_browser_evaluate(self, page, arguments: dict) -> str:
+        """Evaluate JavaScript on the page."""
+        result = await page.evaluate(arguments["script"])
+        return str(result)
+
+    async def _tool_browser_solve_captcha(self, page, arguments: dict) -> str:
+        """Attempt to solve a CAPTCHA on the page."""
+        timeout = arguments.get("timeout", 30)
+        # Created on first use and reused, so templates are loaded from disk only once
+        if self.captcha_solver is None:
+            from src.browser.captcha import CaptchaSolver
+
+            self.captcha_solver = CaptchaSolver()
+        result = await self.captcha_solver.solve(page, timeout=timeout)
+        if result.get("success"):
+            return f"CAPTCHA solved successfully in {result.get('duration', 0):.2f}s"
+        else:
+            error_msg = result.get("error", "Unknown error")
+            return f"Failed to solve CAPTCHA: {error_msg}"
+
+    async def _tool_stealth_scrape(self, page, arguments: dict) -> str:
+        """Scrape the page as Markdown."""
+        stealth_tools = StealthSearchTools(page)
+        markdown = await stealth_tools.scrape_page(
+            url=arguments["url"], include_images=arguments.get("include_images", False)
+        )
+        return markdown
+
+    # Tool name -> handler for _execute_tool (class-level so it needs no per-instance setup)
+    _TOOL_HANDLERS = {
+        "browser_navigate": _tool_browser_navigate,
+        "browser_back": _tool_browser_back,
+        "browser_click": _tool_browser_click,
+        "browser_fill": _tool_browser_fill,
+        "browser_hover": _tool_browser_hover,
+        "browser_screenshot": _tool_browser_screenshot,
+        "browser_evaluate": _tool_browser_evaluate,
+        "browser_solve_captcha": _tool_browser_solve_captcha,
+        "stealth_scrape": _tool_stealth_scrape,
+    }
+
+    # Tools dispatched by _execute_tool_isolated; these take precedence over _TOOL_HANDLERS
+    _ISOLATED_TOOLS = frozenset(
+        ("stealth_search", "stealth_extract", "stealth_extract_many", "stealth_scrape")
+    )
 
     async def initialize(self):
         """Initialize browser manager."""
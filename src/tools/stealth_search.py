@@ -1,10 +1,16 @@
 """Stealth Search and content extraction tools."""
 
+import asyncio
+import functools
+import json
 import logging
-from typing import List, Optional
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from patchright.async_api import Page
 
 try:
@@ -15,23 +21,609 @@ except ImportError:
     md = None
     MARKDOWNIFY_AVAILABLE = False
 
+try:
+    from resiliparse.extract.html2text import extract_plain_text
+    from resiliparse.parse.html import HTMLTree
+
+    RESILIPARSE_AVAILABLE = True
+except ImportError:
+    extract_plain_text = None
+    HTMLTree = None
+    RESILIPARSE_AVAILABLE = False
+
+
+def _class_token_test(attr: str, keyword: str) -> str:
+    """XPath test for a class/id token equal to keyword or starting with "keyword-".
+
+    Matching whole tokens keeps e.g. "lead-paragraph" from matching "ad-".
+    """
+    padded = f"concat(' ', normalize-space(@{attr}), ' ')"
+    return f"contains({padded}, ' {keyword} ') or contains({padded}, ' {keyword}-')"
+
+
+# (attribute, keyword) pairs marking boilerplate widgets, matched as whole tokens
+_BOILERPLATE_TOKENS = (
+    ("class", "cookie"),
+    ("id", "cookie"),
+    ("class", "gdpr"),
+    ("class", "consent"),
+    ("class", "ad"),
+    ("class", "ads"),
+    ("class", "advert"),
+    ("class", "advertisement"),
+    ("class", "social"),
+    ("class", "share"),
+    ("class", "newsletter"),
+)
+
 trafilatura = None
 TRAFILATURA_AVAILABLE = False
+_BOILERPLATE_XPATH = None
 
 try:
     import trafilatura as _trafilatura
+    from lxml import etree
 
     trafilatura = _trafilatura
     TRAFILATURA_AVAILABLE = True
+
+    # Navigation, footers and short cookie/ad/social widgets; compiled once at import.
+    # Class/id matches are limited to short blocks so real content is never dropped.
+    _BOILERPLATE_XPATH = etree.XPath(
+        "//nav | //footer | //aside"
+        " | //*[not(self::html or self::body)]["
+        + " or ".join(_class_token_test(attr, keyword) for attr, keyword in _BOILERPLATE_TOKENS)
+        + "][string-length(normalize-space(.)) < 200]"
+    )
 except ImportError:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Main-content cleanup script returning {title, content} in a single round-trip;
+# __CONTENT_SELECTORS__ is filled in by _build_cleanup_js()
+_CLEANUP_JS_TEMPLATE = """
+    () => {
+        // Create a clone of the body to manipulate without affecting the page
+        const bodyClone = document.body.cloneNode(true);
+        
+        // Aggressively remove non-content elements by tag name
+        const tagsToRemove = [
+            'script', 'style', 'nav', 'header', 'footer', 'aside',
+            'form', 'input', 'button', 'select', 'textarea',
+            'svg', 'canvas', 'video', 'audio', 'iframe', 'embed', 'object',
+            'noscript', 'template', 'dialog', 'menu', 'menuitem'
+        ];
+        
+        tagsToRemove.forEach(tag => {
+            const elements = bodyClone.querySelectorAll(tag);
+            elements.forEach(el => el.remove());
+        });
+        
+        // Remove elements by common class/ID patterns for ads and non-content
+        const adSelectors = [
+            // Ads and sponsored content
+            '[class*="ad"]', '[id*="ad"]', '[class*="advertisement"]',
+            '[class*="sponsored"]', '[class*="promoted"]',
+            '[class*="partner"]', '[class*="affiliate"]',
+            
+            // Cookie banners and GDPR notices
+            '[class*="cookie"]', '[id*="cookie"]', 
+            '[class*="gdpr"]', '[id*="gdpr"]',
+            '[class*="consent"]', '[id*="consent"]',
+            '[class*="privacy"]', '[class*="banner"]',
+            
+            // Social media widgets
+            '[class*="social"]', '[class*="share"]', '[class*="follow"]',
+            '[id*="social"]', '[id*="share"]',
+            
+            // Sidebars and navigation
+            '[class*="sidebar"]', '[id*="sidebar"]',
+            '[class*="menu"]', '[class*="navigation"]', '[class*="nav"]',
+            '[class*="breadcrumb"]', '[id*="breadcrumb"]',
+            
+            // Comments and engagement
+            '[class*="comment"]', '[id*="comment"]',
+            '[class*="disqus"]', '[id*="disqus"]',
+            '[class*="reaction"]', '[class*="rating"]',
+            
+            // Related content widgets
+            '[class*="related"]', '[id*="related"]',
+            '[class*="recommended"]', '[class*="popular"]',
+            '[class*="trending"]', '[class*="more"]',
+            '[class*="read-more"]', '[class*="see-also"]',
+            
+            // Newsletter and subscription
+            '[class*="newsletter"]', '[id*="newsletter"]',
+            '[class*="subscribe"]', '[class*="subscription"]',
+            '[class*="signup"]', '[class*="sign-up"]',
+            
+            // Popups and modals
+            '[class*="popup"]', '[id*="popup"]',
+            '[class*="modal"]', '[id*="modal"]',
+            '[class*="overlay"]', '[id*="overlay"]',
+            '[class*="sticky"]', '[class*="fixed"]',
+            
+            // Author and metadata
+            '[class*="author"]', '[class*="byline"]',
+            '[class*="date"]', '[class*="timestamp"]',
+            '[class*="meta"]', '[class*="metadata"]',
+            
+            // Tags and categories
+            '[class*="tags"]', '[class*="categories"]',
+            '[class*="tag-cloud"]', '[class*="keywords"]'
+        ];
+        
+        adSelectors.forEach(selector => {
+            try {
+                const elements = bodyClone.querySelectorAll(selector);
+                elements.forEach(el => {
+                    // Don't remove if it might be main content
+                    const text = el.textContent || '';
+                    const isShort = text.length < 200;
+                    const isLinkOnly = el.querySelectorAll('a').length > 0 && text.trim().split(/\\s+/).length < 10;
+                    
+                    if (isShort || isLinkOnly) {
+                        el.remove();
+                    }
+                });
+            } catch (e) {
+                // Ignore invalid selectors
+            }
+        });
+        
+        // Remove elements with display:none or visibility:hidden
+        const allElements = bodyClone.querySelectorAll('*');
+        allElements.forEach(el => {
+            try {
+                const style = window.getComputedStyle(el);
+                if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') {
+                    el.remove();
+                }
+            } catch (e) {
+                // Element might be removed already
+            }
+        });
+        
+        // Try to find main content with priority order
+        const contentSelectors = __CONTENT_SELECTORS__;
+
+        let mainContent = null;
+        let bestContentLength = 0;
+        
+        // First pass: try to find by semantic tags
+        for (const selector of contentSelectors) {
+            const el = bodyClone.querySelector(selector);
+            if (el) {
+                const textLength = (el.textContent || '').length;
+                // Prefer longer content if it's substantial
+                if (textLength > bestContentLength && textLength > 500) {
+                    mainContent = el;
+                    bestContentLength = textLength;
+                }
+            }
+        }
+
+        // Second pass: if no good semantic content found, use heuristic scoring
+        if (!mainContent || bestContentLength < 500) {
+            const candidates = bodyClone.querySelectorAll('div, section');
+            let bestScore = 0;
+            
+            candidates.forEach(el => {
+                const text = el.textContent || '';
+                const textLength = text.length;
+                const paragraphs = el.querySelectorAll('p').length;
+                const links = el.querySelectorAll('a').length;
+                const linkDensity = links > 0 ? textLength / links : textLength;
+                
+                // Score based on: text length, paragraph count, and link density
+                // Higher score = more likely to be main content
+                const score = (textLength * 0.5) + (paragraphs * 100) + (linkDensity * 0.3);
+                
+                if (score > bestScore && textLength > 300) {
+                    // Check it's not just a navigation container
+                    const className = (el.className || '').toLowerCase();
+                    const id = (el.id || '').toLowerCase();
+                    const isNavRelated = /nav|menu|sidebar|header|footer|comment|related|meta/.test(className + ' ' + id);
+                    
+                    if (!isNavRelated || paragraphs > 3) {
+                        bestScore = score;
+                        mainContent = el;
+                    }
+                }
+            });
+        }
+
+        // Final fallback to body if no main content found
+        if (!mainContent) {
+            mainContent = bodyClone;
+        }
+
+        // Get text content and clean it up
+        let text = mainContent.innerText || mainContent.textContent || '';
+        
+        // Remove very short lines (likely UI elements)
+        const lines = text.split('\\n');
+        const filteredLines = lines.filter(line => {
+            const trimmed = line.trim();
+            return trimmed.length > 10 || (trimmed.length > 0 && trimmed.includes('.'));
+        });
+        text = filteredLines.join('\\n');
+        
+        // Clean up whitespace
+        text = text.replace(/\\s+/g, ' ').trim();
+        
+        // Remove standalone URLs
+        text = text.replace(/https?:\\/\\/[^\\s]+/g, '');
+        
+        return { title: document.title || '', content: text };
+    }
+"""
+
+
+# Social sharing and engagement prompts
+_SOCIAL_PATTERNS = [
+    r"Share this\s*(article|post|page)?\s*(on\s+\w+)?",
+    r"Share on\s+(Facebook|Twitter|LinkedIn|X|Instagram|Pinterest|Reddit)",
+    r"Follow us\s*(on\s+\w+)?",
+    r"Like us\s*(on\s+\w+)?",
+    r"Connect with us",
+    r"Join the conversation",
+    r"Leave a comment",
+    r"Add a comment",
+    r"Post a comment",
+    r"\d+\s*(likes?|shares?|comments?|reactions?)",
+]
+
+# Navigation and action prompts
+_ACTION_PATTERNS = [
+    r"Read more\s*(about this)?",
+    r"Click here\s*(to\s+\w+)?",
+    r"Learn more\s*(about)?",
+    r"Find out more",
+    r"Discover more",
+    r"See more",
+    r"View more",
+    r"Show more",
+    r"Expand\s*(for more)?",
+    r"Continue reading",
+    r"Skip to\s*(content|main|navigation)?",
+    r"Jump to\s*\w+",
+    r"Back to\s*(top|main|home)?",
+    r"Go back",
+    r"Next\s*(page|article|post)?",
+    r"Previous\s*(page|article|post)?",
+]
+
+# Subscription prompts
+_SUBSCRIPTION_PATTERNS = [
+    r"Subscribe\s*(to\s+\w+)?\s*(now)?",
+    r"Sign up\s*(for\s+\w+)?\s*(now)?",
+    r"Join\s*(our)?\s*(newsletter|list|community)",
+    r"Newsletter\s*(signup|sign-up|subscription)?",
+    r"Get\s+\w+\s+delivered\s+to\s+your\s+inbox",
+    r"Stay\s+(updated|informed|connected)",
+    r"Never\s+miss\s+(a|an)\s+\w+",
+]
+
+# Cookie and privacy notices
+_COOKIE_PATTERNS = [
+    r"Cookie\s*(Policy|Notice|Settings|Consent|Banner)?",
+    r"This\s+site\s+uses\s+cookies",
+    r"We\s+use\s+cookies\s+(to\s+\w+)?",
+    r"By\s+(using|continuing|clicking)\s+.*?(you\s+agree|accept|consent)",
+    r"Accept\s*(all)?\s*cookies",
+    r"Cookie\s*preferences",
+    r"Privacy\s*(Policy|Notice|Settings)",
+    r"Terms\s*(of\s*Service|and\s*Conditions|of\s*Use)?",
+    r"GDPR\s*compliance",
+    r"California\s*Consumer\s*Privacy",
+    r"Do\s*Not\s*Sell\s*My\s*Information",
+]
+
+# Common navigation text
+_NAV_PATTERNS = [
+    r"Home\s*»?\s*",
+    r"Menu\s*" r"Navigation\s*",
+    r"Site\s*Map",
+    r"Sitemap",
+    r"Search\s*(this\s*site)?",
+    r"Quick\s*Links",
+    r"Related\s*(Links|Pages|Articles|Posts)?",
+    r"You\s*might\s*also\s*like",
+    r"Recommended\s*(for\s*you)?",
+    r"Popular\s*\w+",
+    r"Trending\s*\w+",
+    r"Most\s*(Read|Viewed|Popular)",
+]
+
+# Ad-related text
+_AD_PATTERNS = [
+    r"Advertisement\s*",
+    r"Ad\s*\d*\s*",
+    r"Sponsored\s*(content|post|link)?",
+    r"Promoted\s*(content|post)?",
+    r"Partner\s*content",
+    r"Paid\s*(content|partnership)?",
+    r"Affiliate\s*(link|disclosure)?",
+]
+
+# Copyright and legal text
+_LEGAL_PATTERNS = [
+    r"©\s*\d{4}.*?(All\s+rights\s+reserved)?",
+    r"Copyright\s*©?\s*\d{4}",
+    r"All\s+rights\s+reserved",
+    r"Trademark\s*(notice)?",
+    r"Legal\s*(notice|disclaimer)",
+    r"Disclaimer",
+]
+
+# Timestamps and dates that appear alone
+_DATE_PATTERNS = [
+    r"\b\d{1,2}\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b",
+    r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
+    r"\b\d{1,2}/\d{1,2}/\d{2,4}\b",
+    r"\b\d{4}-\d{2}-\d{2}\b",
+    r"\d+\s+(minutes?|hours?|days?|weeks?|months?|years?)\s+ago",
+    r"Updated?\s*:?\s*.*\d{4}",
+    r"Published?\s*:?\s*.*\d{4}",
+]
+
+# casefold() misses one equivalence re.IGNORECASE applies: dotless ı matches i
+_IGNORECASE_FOLD = str.maketrans({"\u0131": "i"})
+
+
+def _fold(text: str) -> str:
+    """Casefold text so a literal prefix is found wherever its pattern could match."""
+    return text.casefold().translate(_IGNORECASE_FOLD)
+
+
+# Leading run of a pattern that contains no regex syntax
+_LITERAL_PREFIX_RE = re.compile(r"[^\\()\[\]{}?*+.|^$]*")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the casefolded text every match of a boilerplate pattern starts with.
+
+    Patterns that open with a class or group (dates, counters) return "", which is
+    contained in every string, so they are always applied.
+    """
+    prefix = _LITERAL_PREFIX_RE.match(pattern).group()
+    if pattern[len(prefix) : len(prefix) + 1] in ("?", "*", "{"):
+        prefix = prefix[:-1]  # A quantifier makes the last character optional
+    return _fold(prefix)
+
+
+# All boilerplate patterns, compiled once and paired with their literal prefix. They are
+# applied one after another, in this order: a single alternation would let an earlier
+# match swallow text a later pattern is meant to remove, changing the output
+_BOILERPLATE_TEXT_PATTERNS = tuple(
+    (_literal_prefix(pattern), re.compile(pattern, re.IGNORECASE))
+    for pattern in (
+        *_SOCIAL_PATTERNS,
+        *_ACTION_PATTERNS,
+        *_SUBSCRIPTION_PATTERNS,
+        *_COOKIE_PATTERNS,
+        *_NAV_PATTERNS,
+        *_AD_PATTERNS,
+        *_LEGAL_PATTERNS,
+        *_DATE_PATTERNS,
+    )
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+# Search results + AI summary extraction script; __MAX_RESULTS__ is filled in by
+# _build_search_js()
+_SEARCH_JS_TEMPLATE = """
+    () => {
+        const results = [];
+        const seenUrls = new Set();
+        let aiSummary = null;
+
+        // --- AI Summary Extraction ---
+        // Updated 2026-02-10: Brave uses .chatllm-answer-list class for AI responses
+        const aiSummarySelectors = [
+            '.chatllm-answer-list',  // Brave's current AI answer class
+            '[class*="chatllm-answer"]',
+            '[class*="answer"]',  // Any class containing "answer"
+            '.answer',
+            '[data-component="Summarizer"]',
+            '.summarizer-container',
+            '.summarizer',
+            '#answer-box',
+            '.summary',
+            '#summary',
+            '[class*="ai-answer"]',
+            '[class*="ai-response"]'
+        ];
+
+        for (const sel of aiSummarySelectors) {
+            const el = document.querySelector(sel);
+            if (el) {
+                console.log('AI Summary found with selector:', sel, 'class:', el.className);
+                
+                // Debug: Log the full element text and child structure
+                const fullText = el.textContent.trim();
+                console.log('Full element text (first 200 chars):', fullText.substring(0, 200));
+                
+                // Get text directly from the element itself (not looking for children)
+                // Brave's chatllm-answer-list has the text directly
+                const clone = el.cloneNode(true);
+                
+                // Remove only citation/reference elements, not content
+                clone.querySelectorAll('sup.citation, .cite-link, [data-cite]').forEach(e => e.remove());
+                
+                const text = clone.textContent.trim().replace(/\\s+/g, ' ');
+                console.log('Extracted text length:', text.length, 'preview:', text.substring(0, 150));
+                
+                // Extract citations from the original element (look in parent too)
+                const citationContainer = el.closest('[class*="answer"]') || el;
+                const sources = Array.from(citationContainer.querySelectorAll('a[href]')).map(a => ({
+                    title: a.textContent.trim() || a.hostname,
+                    url: a.href
+                })).filter(s => s.url.startsWith('http') && !s.url.includes('search.brave.com') && !s.url.includes('imgs.search.brave.com') && s.title.length > 1);
+
+                // Deduplicate sources
+                const uniqueSources = [];
+                const seenSourceUrls = new Set();
+                for (const s of sources) {
+                    if (!seenSourceUrls.has(s.url)) {
+                        seenSourceUrls.add(s.url);
+                        uniqueSources.push(s);
+                    }
+                }
+
+                if (text.length > 20) {
+                    aiSummary = { text, sources: uniqueSources };
+                    console.log('Extracted AI Summary text length:', text.length);
+                    break;
+                }
+            }
+        }
+
+        // --- Web Results Extraction ---
+        // Strategy 1: Try Brave Search specific selectors (newest structure)
+        const braveSelectors = [
+            '#results .snippet:has(a.l1)',
+            '#results [data-component="Result"]',
+            '.snippet:has(a.l1)',
+            '#results .snippet',
+            '.snippet',
+            'div[data-loc="main"] > div > div',
+            'main article',
+            'article[data-loc]',
+            '.search-result',
+            '.result-item',
+            '[data-component="search-result"]'
+        ];
+
+        let resultElements = [];
+        for (const sel of braveSelectors) {
+            const elements = document.querySelectorAll(sel);
+            if (elements.length > 0) {
+                resultElements = elements;
+                break;
+            }
+        }
+
+        // Strategy 2: If no structured results, find all external links
+        if (resultElements.length === 0) {
+            const allLinks = Array.from(document.querySelectorAll('a[href^="https://"]'));
+            const searchLinks = allLinks.filter(a => {
+                const href = a.href;
+                const text = a.textContent.trim();
+                return href &&
+                       text.length > 5 &&
+                       !href.includes('search.brave.com') &&
+                       !href.includes('brave.com/') &&
+                       !href.includes('imgs.search.brave.com') &&
+                       !a.closest('nav') &&
+                       !a.closest('footer');
+            });
+
+            const containers = new Map();
+            for (const link of searchLinks) {
+                let parent = link.closest('article, section, div[class*="result"], div[class*=\"item\"], li');
+                if (!parent) parent = link.parentElement?.parentElement?.parentElement;
+                if (parent && !containers.has(parent)) containers.set(parent, link);
+            }
+            resultElements = Array.from(containers.keys());
+        }
+
+        // Extract results from elements
+        for (let i = 0; i < Math.min(resultElements.length, __MAX_RESULTS__); i++) {
+            const element = resultElements[i];
+            let title = '';
+            let url = '';
+            let snippet = '';
+
+            const titleLink = element.querySelector('a.l1') ||
+                             element.querySelector('a[href^="https://"]') ||
+                             element.querySelector('a[href^="http://"]') ||
+                             element.querySelector('a');
+            if (titleLink) {
+                url = titleLink.href;
+                const titleEl = titleLink.querySelector('.title') || 
+                                element.querySelector('h2, h3, [class*="title"]');
+                title = titleEl ? titleEl.textContent.trim() : titleLink.textContent.trim();
+            }
+
+            const snippetEl = element.querySelector('p, [class*="description"], [class*="snippet"], [data-loc="snippet"]');
+            if (snippetEl) snippet = snippetEl.textContent.trim();
+
+            if (title && url && !seenUrls.has(url) && url.startsWith('http')) {
+                seenUrls.add(url);
+                results.push({
+                    title: title.substring(0, 200),
+                    url: url,
+                    snippet: snippet.substring(0, 500),
+                    position: results.length + 1
+                });
+            }
+        }
+
+        return { results, aiSummary };
+    }
+    """
+
+
+@functools.lru_cache(maxsize=32)
+def _join_selectors(selectors: Tuple[str, ...]) -> str:
+    """Join CSS selectors into a single selector list (cached per selector tuple)."""
+    return ", ".join(selectors)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_cleanup_js(content_selectors: Tuple[str, ...]) -> str:
+    """Build the main-content cleanup script for the given content selectors.
+
+    The result is cached so repeated extractions reuse the same script string.
+    """
+    return _CLEANUP_JS_TEMPLATE.replace(
+        "__CONTENT_SELECTORS__", json.dumps(list(content_selectors))
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _build_search_js(max_results: int) -> str:
+    """Build the search results extraction script for a result count.
+
+    Every valid count (1..MAX_COUNT) fits in the cache, so the default count=10 and any
+    other count are only formatted once per process.
+    """
+    return _SEARCH_JS_TEMPLATE.replace("__MAX_RESULTS__", str(max_results))
+
+
+def _prune_boilerplate(tree) -> None:
+    """Remove boilerplate nodes from a parsed lxml tree in place."""
+    for el in _BOILERPLATE_XPATH(tree):
+        el.drop_tree()  # Keeps the tail text, unlike getparent().remove()
+
+
+# Response validators stored with cached extractions, mapped to the conditional request
+# headers that revalidate them
+_CONDITIONAL_HEADERS = {"etag": "If-None-Match", "last-modified": "If-Modified-Since"}
+
+
+def _cache_validators(response) -> Dict[str, str]:
+    """Collect the ETag / Last-Modified headers of a navigation response."""
+    headers = response.headers if response is not None else {}
+    return {name: headers[name] for name in _CONDITIONAL_HEADERS if name in headers}
+
+
+# (cache_scope, url, max_length) -> (stored_at, validators, result)
+_ExtractCacheKey = Tuple[Optional[str], str, int]
+_ExtractCacheEntry = Tuple[float, Dict[str, str], "ExtractedContent"]
+
 
 class SearchResult(BaseModel):
     """Model for search result data."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     title: str
     url: str
     snippet: str
@@ -41,6 +633,8 @@ class SearchResult(BaseModel):
 class AISummary(BaseModel):
     """AI-generated summary from Brave Search."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     text: str
     sources: List[dict] = []  # List of {title, url}
 
@@ -48,6 +642,8 @@ class AISummary(BaseModel):
 class SearchResponse(BaseModel):
     """Complete search response with optional AI summary."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     ai_summary: Optional[AISummary] = None
     results: List[SearchResult]
     query: str
@@ -58,6 +654,8 @@ class SearchResponse(BaseModel):
 class ExtractedContent(BaseModel):
     """Model for extracted content data."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     title: str
     url: str
     content: str
@@ -72,8 +670,91 @@ class StealthSearchTools:
     MAX_PAGE = 100
     MAX_COUNT = 100
 
-    def __init__(self, page: Page):
+    # Brave's AI answer uses multiple possible selectors
+    # Updated 2026-02: Brave uses .answer class and data attributes
+    AI_SUMMARY_SELECTORS: Tuple[str, ...] = (
+        ".answer",  # Main AI answer container
+        '[data-component="Summarizer"]',
+        ".summarizer",
+        "#answer-box",
+        '[class*="answer"]',
+        '[class*="ai-response"]',
+        ".snippet",
+    )
+
+    # Main content containers, in priority order
+    CONTENT_SELECTORS: Tuple[str, ...] = (
+        # High priority semantic tags
+        "article",
+        "main",
+        '[role="main"]',
+        # Common content containers
+        ".content",
+        "#content",
+        ".main-content",
+        "#main-content",
+        ".post-content",
+        ".article-content",
+        ".entry-content",
+        ".page-content",
+        # Blog/CMS specific
+        ".post-body",
+        ".entry-body",
+        ".article-body",
+        '[itemprop="articleBody"]',
+        # News sites
+        ".story-body",
+        ".story-content",
+        ".news-content",
+        # Generic fallbacks
+        ".body",
+        "#body",
+        '[class*="content"]',
+        '[id*="content"]',
+    )
+
+    # Upper bound on waiting for network idle after navigation in extract(), in seconds
+    NETWORK_IDLE_TIMEOUT = 2.0
+
+    # extract() results are shared across instances (the server builds one per call),
+    # keyed by (cache_scope, url, max_length) and kept in LRU order. Entries older than
+    # EXTRACT_CACHE_TTL seconds are revalidated against their ETag / Last-Modified
+    EXTRACT_CACHE_TTL = 300.0
+    EXTRACT_CACHE_SIZE = 256
+    _extract_cache: "OrderedDict[_ExtractCacheKey, _ExtractCacheEntry]" = OrderedDict()
+
+    def __init__(self, page: Page, cache_scope: Optional[str] = None):
+        """Initialize search tools.
+
+        Args:
+            page: Page used for navigation and extraction
+            cache_scope: Partition of the extract() cache to use. Pages whose context
+                carries its own cookies or logins (sub-agent sessions) pass their session
+                ID so they never see another session's results
+        """
         self.page = page
+        self.cache_scope = cache_scope
+
+    @classmethod
+    def validate_search_params(cls, query: Optional[str], count: int, page: int) -> None:
+        """Validate search arguments synchronously, before any browser work.
+
+        Args:
+            query: Search query string
+            count: Number of results to return
+            page: Page number for pagination
+
+        Raises:
+            ValueError: If the query is empty or count/page are out of range
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        if not 1 <= page <= cls.MAX_PAGE:
+            raise ValueError(f"Page must be between 1 and {cls.MAX_PAGE}")
+
+        if not 1 <= count <= cls.MAX_COUNT:
+            raise ValueError(f"Count must be between 1 and {cls.MAX_COUNT}")
 
     async def search(self, query: str, count: int = 10, page: int = 1) -> SearchResponse:
         """Search Brave Search and return structured results.
@@ -86,14 +767,7 @@ class StealthSearchTools:
         Returns:
             SearchResponse object containing results and optional AI summary
         """
-        if not query or not query.strip():
-            raise ValueError("Query cannot be empty")
-
-        if page < 1 or page > self.MAX_PAGE:
-            raise ValueError(f"Page must be between 1 and {self.MAX_PAGE}")
-
-        if count < 1 or count > self.MAX_COUNT:
-            raise ValueError(f"Count must be between 1 and {self.MAX_COUNT}")
+        self.validate_search_params(query, count, page)
 
         logger.info(f"Searching Brave for: {query} (count={count}, page={page})")
 
@@ -123,20 +797,8 @@ class StealthSearchTools:
             # Optional: Wait for AI summary to appear (it can be slow)
             logger.info("Waiting for AI Summary...")
             try:
-                # Brave's AI answer uses multiple possible selectors
-                # Updated 2026-02: Brave uses .answer class and data attributes
-                ai_selectors = [
-                    ".answer",  # Main AI answer container
-                    '[data-component="Summarizer"]',
-                    ".summarizer",
-                    "#answer-box",
-                    '[class*="answer"]',
-                    '[class*="ai-response"]',
-                    ".snippet",
-                ]
-                selector_list = ", ".join(ai_selectors)
                 await self.page.wait_for_selector(
-                    selector_list,
+                    _join_selectors(self.AI_SUMMARY_SELECTORS),
                     timeout=15000,
                 )
                 logger.info("AI Summary element detected on page")
@@ -204,159 +866,7 @@ class StealthSearchTools:
             logger.info(f"AI Debug info: {ai_debug}")
 
         # Extract search results and AI summary using JavaScript
-        data = await self.page.evaluate(
-            f"""
-            () => {{
-                const results = [];
-                const seenUrls = new Set();
-                let aiSummary = null;
-
-                // --- AI Summary Extraction ---
-                // Updated 2026-02-10: Brave uses .chatllm-answer-list class for AI responses
-                const aiSummarySelectors = [
-                    '.chatllm-answer-list',  // Brave's current AI answer class
-                    '[class*="chatllm-answer"]',
-                    '[class*="answer"]',  // Any class containing "answer"
-                    '.answer',
-                    '[data-component="Summarizer"]',
-                    '.summarizer-container',
-                    '.summarizer',
-                    '#answer-box',
-                    '.summary',
-                    '#summary',
-                    '[class*="ai-answer"]',
-                    '[class*="ai-response"]'
-                ];
-
-                for (const sel of aiSummarySelectors) {{
-                    const el = document.querySelector(sel);
-                    if (el) {{
-                        console.log('AI Summary found with selector:', sel, 'class:', el.className);
-                        
-                        // Debug: Log the full element text and child structure
-                        const fullText = el.textContent.trim();
-                        console.log('Full element text (first 200 chars):', fullText.substring(0, 200));
-                        
-                        // Get text directly from the element itself (not looking for children)
-                        // Brave's chatllm-answer-list has the text directly
-                        const clone = el.cloneNode(true);
-                        
-                        // Remove only citation/reference elements, not content
-                        clone.querySelectorAll('sup.citation, .cite-link, [data-cite]').forEach(e => e.remove());
-                        
-                        const text = clone.textContent.trim().replace(/\\s+/g, ' ');
-                        console.log('Extracted text length:', text.length, 'preview:', text.substring(0, 150));
-                        
-                        // Extract citations from the original element (look in parent too)
-                        const citationContainer = el.closest('[class*="answer"]') || el;
-                        const sources = Array.from(citationContainer.querySelectorAll('a[href]')).map(a => ({{
-                            title: a.textContent.trim() || a.hostname,
-                            url: a.href
-                        }})).filter(s => s.url.startsWith('http') && !s.url.includes('search.brave.com') && !s.url.includes('imgs.search.brave.com') && s.title.length > 1);
-
-                        // Deduplicate sources
-                        const uniqueSources = [];
-                        const seenSourceUrls = new Set();
-                        for (const s of sources) {{
-                            if (!seenSourceUrls.has(s.url)) {{
-                                seenSourceUrls.add(s.url);
-                                uniqueSources.push(s);
-                            }}
-                        }}
-
-                        if (text.length > 20) {{
-                            aiSummary = {{ text, sources: uniqueSources }};
-                            console.log('Extracted AI Summary text length:', text.length);
-                            break;
-                        }}
-                    }}
-                }}
-
-                // --- Web Results Extraction ---
-                // Strategy 1: Try Brave Search specific selectors (newest structure)
-                const braveSelectors = [
-                    '#results .snippet:has(a.l1)',
-                    '#results [data-component="Result"]',
-                    '.snippet:has(a.l1)',
-                    '#results .snippet',
-                    '.snippet',
-                    'div[data-loc="main"] > div > div',
-                    'main article',
-                    'article[data-loc]',
-                    '.search-result',
-                    '.result-item',
-                    '[data-component="search-result"]'
-                ];
-
-                let resultElements = [];
-                for (const sel of braveSelectors) {{
-                    const elements = document.querySelectorAll(sel);
-                    if (elements.length > 0) {{
-                        resultElements = elements;
-                        break;
-                    }}
-                }}
-
-                // Strategy 2: If no structured results, find all external links
-                if (resultElements.length === 0) {{
-                    const allLinks = Array.from(document.querySelectorAll('a[href^="https://"]'));
-                    const searchLinks = allLinks.filter(a => {{
-                        const href = a.href;
-                        const text = a.textContent.trim();
-                        return href &&
-                               text.length > 5 &&
-                               !href.includes('search.brave.com') &&
-                               !href.includes('brave.com/') &&
-                               !href.includes('imgs.search.brave.com') &&
-                               !a.closest('nav') &&
-                               !a.closest('footer');
-                    }});
-
-                    const containers = new Map();
-                    for (const link of searchLinks) {{
-                        let parent = link.closest('article, section, div[class*="result"], div[class*=\"item\"], li');
-                        if (!parent) parent = link.parentElement?.parentElement?.parentElement;
-                        if (parent && !containers.has(parent)) containers.set(parent, link);
-                    }}
-                    resultElements = Array.from(containers.keys());
-                }}
-
-                // Extract results from elements
-                for (let i = 0; i < Math.min(resultElements.length, {count}); i++) {{
-                    const element = resultElements[i];
-                    let title = '';
-                    let url = '';
-                    let snippet = '';
-
-                    const titleLink = element.querySelector('a.l1') ||
-                                     element.querySelector('a[href^="https://"]') ||
-                                     element.querySelector('a[href^="http://"]') ||
-                                     element.querySelector('a');
-                    if (titleLink) {{
-                        url = titleLink.href;
-                        const titleEl = titleLink.querySelector('.title') || 
-                                        element.querySelector('h2, h3, [class*="title"]');
-                        title = titleEl ? titleEl.textContent.trim() : titleLink.textContent.trim();
-                    }}
-
-                    const snippetEl = element.querySelector('p, [class*="description"], [class*="snippet"], [data-loc="snippet"]');
-                    if (snippetEl) snippet = snippetEl.textContent.trim();
-
-                    if (title && url && !seenUrls.has(url) && url.startsWith('http')) {{
-                        seenUrls.add(url);
-                        results.push({{
-                            title: title.substring(0, 200),
-                            url: url,
-                            snippet: snippet.substring(0, 500),
-                            position: results.length + 1
-                        }});
-                    }}
-                }}
-
-                return {{ results, aiSummary }};
-            }}
-            """
-        )
+        data = await self.page.evaluate(_build_search_js(count))
 
         results = data.get("results", [])
         ai_summary_data = data.get("aiSummary")
@@ -403,63 +913,147 @@ class StealthSearchTools:
             has_next_page=has_next_page,
         )
 
-    async def extract(self, url: str, max_length: int = 5000) -> ExtractedContent:
+    async def extract(
+        self, url: str, max_length: int = 5000, use_cache: bool = True
+    ) -> ExtractedContent:
         """Extract clean content from a URL.
 
         Args:
             url: URL to extract content from
             max_length: Maximum content length (default: 5000)
+            use_cache: Reuse a recent extraction of the same URL (default: True). Pass
+                False to always load the page and skip storing the result
 
         Returns:
             ExtractedContent object with clean text
         """
-        logger.info(f"Extracting content from: {url}")
+        if not use_cache:
+            result, _ = await self._extract_uncached(url, max_length)
+            return result
+
+        key = (self.cache_scope, url, max_length)
+        cache = StealthSearchTools._extract_cache
+        hit = cache.get(key)
+        if hit is not None:
+            stored_at, validators, cached = hit
+            fresh = time.monotonic() - stored_at < self.EXTRACT_CACHE_TTL
+            if not fresh and await self._is_unmodified(url, validators):
+                # The server confirmed the page is unchanged, so start a new TTL window
+                cache[key] = (time.monotonic(), validators, cached)
+                fresh = True
+            if fresh:
+                cache.move_to_end(key)
+                logger.info(f"Returning cached extraction for: {url}")
+                return cached
+            cache.pop(key, None)
+
+        result, validators = await self._extract_uncached(url, max_length)
+
+        # ExtractedContent is frozen, so the cached instance can be handed out as-is
+        if result.content:
+            cache[key] = (time.monotonic(), validators, result)
+            cache.move_to_end(key)
+            while len(cache) > self.EXTRACT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return result
+
+    async def _is_unmodified(self, url: str, validators: Dict[str, str]) -> bool:
+        """Check with a conditional GET whether a cached page is still current.
+
+        The request goes through the page's browser context, so it carries the same
+        cookies as the original navigation. Only a 304 response counts as unchanged.
+        """
+        if not validators:
+            return False
 
-        # Navigate to the URL with better timeout handling
-        await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        await self.page.wait_for_timeout(2000)
+        headers = {_CONDITIONAL_HEADERS[name]: value for name, value in validators.items()}
+        try:
+            response = await self.page.context.request.get(url, headers=headers, timeout=10000)
+        except Exception as e:
+            logger.debug(f"Cache revalidation failed for {url}: {e}")
+            return False
 
-        # Wait for content to load
-        await self.page.wait_for_timeout(2000)
+        try:
+            return response.status == 304
+        finally:
+            await response.dispose()
 
-        # Try trafilatura first if available
-        if TRAFILATURA_AVAILABLE and trafilatura is not None:
-            try:
-                html_content = await self.page.content()
-                extracted = trafilatura.extract(
-                    html_content,
-                    include_comments=False,
-                    include_tables=False,
-                    no_fallback=False,
-                    output_format="json",
-                )
+    @classmethod
+    def clear_extract_cache(cls) -> None:
+        """Drop all cached extract() results."""
+        cls._extract_cache.clear()
 
-                if extracted:
-                    import json
+    async def _extract_uncached(
+        self, url: str, max_length: int
+    ) -> Tuple[ExtractedContent, Dict[str, str]]:
+        """Navigate to a URL and extract its content, bypassing the cache.
 
-                    data = json.loads(extracted)
-                    title = data.get("title", "")
-                    text = data.get("text", "")
+        Returns:
+            The extracted content and the response's cache validators
+        """
+        logger.info(f"Extracting content from: {url}")
+
+        # Navigate to the URL with better timeout handling
+        response = await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+        # Wait for the network to go idle instead of sleeping a fixed settle time, capped
+        # so pages with long-polling or analytics beacons don't stall extraction
+        try:
+            await asyncio.wait_for(
+                self.page.wait_for_load_state("networkidle"), timeout=self.NETWORK_IDLE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.debug(f"Network did not go idle for {url}, extracting anyway")
 
-                    # Clean up the text
-                    text = self._clean_content(text)
+        return await self._extract_loaded_page(url, max_length), _cache_validators(response)
 
-                    # Truncate if needed
-                    if len(text) > max_length:
-                        text = text[:max_length].rsplit(" ", 1)[0] + "..."
+    async def _extract_loaded_page(self, url: str, max_length: int) -> ExtractedContent:
+        """Extract content from the page currently loaded at url."""
+        # Fetch the HTML once and share it between the HTML-based extractors
+        html_content = None
+        if RESILIPARSE_AVAILABLE or TRAFILATURA_AVAILABLE:
+            try:
+                html_content = await self.page.content()
+            except Exception as e:
+                logger.warning(f"Could not read page HTML: {e}")
 
-                    # Generate summary if content is long
-                    summary = None
-                    word_count = len(text.split())
-                    if word_count > 100:
-                        summary = self._generate_summary(text)
+        # Fast path: Resiliparse's C++ main-content extractor, if installed
+        if RESILIPARSE_AVAILABLE and html_content is not None:
+            try:
+                html_tree = HTMLTree.parse(html_content)
+                text = extract_plain_text(html_tree, main_content=True, preserve_formatting=False)
+                if text.strip():
+                    title = html_tree.title or await self._get_page_title()
+                    return self._build_extracted_content(title, url, text, max_length)
+            except Exception as e:
+                logger.warning(f"Resiliparse extraction failed: {e}")
 
-                    return ExtractedContent(
-                        title=title or await self._get_page_title(),
-                        url=url,
-                        content=text,
-                        summary=summary,
-                        word_count=word_count,
+        # Then trafilatura if available
+        if TRAFILATURA_AVAILABLE and trafilatura is not None and html_content is not None:
+            try:
+                # Parse once into an lxml tree.
+                # Pass the str as-is: bytes would make trafilatura sniff and re-decode the charset
+                tree = trafilatura.load_html(html_content)
+                data = None
+                if tree is not None:
+                    _prune_boilerplate(tree)
+                    # bare_extraction hands back Python data directly, avoiding a
+                    # JSON encode + json.loads round-trip
+                    data = trafilatura.bare_extraction(
+                        tree,
+                        include_comments=False,
+                        include_tables=False,
+                        no_fallback=False,
+                        with_metadata=True,
+                    )
+                    if data is not None and not isinstance(data, dict):
+                        data = data.as_dict()  # trafilatura >= 2.0 returns a Document
+
+                if data:
+                    # Pages without title metadata fall back to document.title
+                    title = data.get("title") or await self._get_page_title()
+                    return self._build_extracted_content(
+                        title, url, data.get("text") or "", max_length
                     )
             except Exception as e:
                 logger.warning(f"Trafilatura extraction failed: {e}")
@@ -467,6 +1061,50 @@ class StealthSearchTools:
         # Fallback to JavaScript extraction
         return await self._extract_with_js(url, max_length)
 
+    async def extract_many(
+        self, urls: List[str], max_length: int = 5000, concurrency: int = 4
+    ) -> List[Optional[ExtractedContent]]:
+        """Extract clean content from several URLs concurrently.
+
+        Each URL is loaded in its own page opened in this page's browser context, so
+        navigations and settle waits overlap instead of running back to back.
+
+        Args:
+            urls: URLs to extract content from
+            max_length: Maximum content length per URL (default: 5000)
+            concurrency: Maximum number of pages open at once (default: 4)
+
+        Returns:
+            List of ExtractedContent objects in the same order as urls, with None for
+            URLs that failed to load or extract
+
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        context = self.page.context
+
+        async def _extract_one(url: str) -> Optional[ExtractedContent]:
+            async with semaphore:
+                page = await context.new_page()
+                try:
+                    tools = StealthSearchTools(page, cache_scope=self.cache_scope)
+                    return await tools.extract(url, max_length)
+                except Exception as e:
+                    logger.warning(f"Batch extraction failed for {url}: {e}")
+                    return None
+                finally:
+                    try:
+                        await page.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing extraction page for {url}: {e}")
+
+        logger.info(f"Extracting content from {len(urls)} URLs (concurrency={concurrency})")
+        return list(await asyncio.gather(*(_extract_one(url) for url in urls)))
+
     async def scrape_page(self, url: str, include_images: bool = False) -> str:
         """Deep page scraper that returns full content in Markdown.
 
@@ -500,9 +1138,7 @@ class StealthSearchTools:
             markdown = md(html_content, **kwargs)
 
             # Basic cleanup: remove excess newlines
-            import re
-
-            markdown = re.sub(r"\n{3,}", "\n\n", markdown)
+            markdown = _EXCESS_NEWLINES_RE.sub("\n\n", markdown)
             return markdown.strip()
         else:
             # Fallback to basic text if markdownify is not available
@@ -512,230 +1148,40 @@ class StealthSearchTools:
     async def _extract_with_js(self, url: str, max_length: int) -> ExtractedContent:
         """Extract content using JavaScript as fallback with aggressive cleaning."""
 
-        # Get page title
-        title = await self._get_page_title()
-
-        # Extract main content using heuristics with aggressive element removal
-        content = await self.page.evaluate(
-            """
-            () => {
-                // Create a clone of the body to manipulate without affecting the page
-                const bodyClone = document.body.cloneNode(true);
-                
-                // Aggressively remove non-content elements by tag name
-                const tagsToRemove = [
-                    'script', 'style', 'nav', 'header', 'footer', 'aside',
-                    'form', 'input', 'button', 'select', 'textarea',
-                    'svg', 'canvas', 'video', 'audio', 'iframe', 'embed', 'object',
-                    'noscript', 'template', 'dialog', 'menu', 'menuitem'
-                ];
-                
-                tagsToRemove.forEach(tag => {
-                    const elements = bodyClone.querySelectorAll(tag);
-                    elements.forEach(el => el.remove());
-                });
-                
-                // Remove elements by common class/ID patterns for ads and non-content
-                const adSelectors = [
-                    // Ads and sponsored content
-                    '[class*="ad"]', '[id*="ad"]', '[class*="advertisement"]',
-                    '[class*="sponsored"]', '[class*="promoted"]',
-                    '[class*="partner"]', '[class*="affiliate"]',
-                    
-                    // Cookie banners and GDPR notices
-                    '[class*="cookie"]', '[id*="cookie"]', 
-                    '[class*="gdpr"]', '[id*="gdpr"]',
-                    '[class*="consent"]', '[id*="consent"]',
-                    '[class*="privacy"]', '[class*="banner"]',
-                    
-                    // Social media widgets
-                    '[class*="social"]', '[class*="share"]', '[class*="follow"]',
-                    '[id*="social"]', '[id*="share"]',
-                    
-                    // Sidebars and navigation
-                    '[class*="sidebar"]', '[id*="sidebar"]',
-                    '[class*="menu"]', '[class*="navigation"]', '[class*="nav"]',
-                    '[class*="breadcrumb"]', '[id*="breadcrumb"]',
-                    
-                    // Comments and engagement
-                    '[class*="comment"]', '[id*="comment"]',
-                    '[class*="disqus"]', '[id*="disqus"]',
-                    '[class*="reaction"]', '[class*="rating"]',
-                    
-                    // Related content widgets
-                    '[class*="related"]', '[id*="related"]',
-                    '[class*="recommended"]', '[class*="popular"]',
-                    '[class*="trending"]', '[class*="more"]',
-                    '[class*="read-more"]', '[class*="see-also"]',
-                    
-                    // Newsletter and subscription
-                    '[class*="newsletter"]', '[id*="newsletter"]',
-                    '[class*="subscribe"]', '[class*="subscription"]',
-                    '[class*="signup"]', '[class*="sign-up"]',
-                    
-                    // Popups and modals
-                    '[class*="popup"]', '[id*="popup"]',
-                    '[class*="modal"]', '[id*="modal"]',
-                    '[class*="overlay"]', '[id*="overlay"]',
-                    '[class*="sticky"]', '[class*="fixed"]',
-                    
-                    // Author and metadata
-                    '[class*="author"]', '[class*="byline"]',
-                    '[class*="date"]', '[class*="timestamp"]',
-                    '[class*="meta"]', '[class*="metadata"]',
-                    
-                    // Tags and categories
-                    '[class*="tags"]', '[class*="categories"]',
-                    '[class*="tag-cloud"]', '[class*="keywords"]'
-                ];
-                
-                adSelectors.forEach(selector => {
-                    try {
-                        const elements = bodyClone.querySelectorAll(selector);
-                        elements.forEach(el => {
-                            // Don't remove if it might be main content
-                            const text = el.textContent || '';
-                            const isShort = text.length < 200;
-                            const isLinkOnly = el.querySelectorAll('a').length > 0 && text.trim().split(/\\s+/).length < 10;
-                            
-                            if (isShort || isLinkOnly) {
-                                el.remove();
-                            }
-                        });
-                    } catch (e) {
-                        // Ignore invalid selectors
-                    }
-                });
-                
-                // Remove elements with display:none or visibility:hidden
-                const allElements = bodyClone.querySelectorAll('*');
-                allElements.forEach(el => {
-                    try {
-                        const style = window.getComputedStyle(el);
-                        if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') {
-                            el.remove();
-                        }
-                    } catch (e) {
-                        // Element might be removed already
-                    }
-                });
-                
-                // Try to find main content with priority order
-                const contentSelectors = [
-                    // High priority semantic tags
-                    'article',
-                    'main',
-                    '[role="main"]',
-                    
-                    // Common content containers
-                    '.content',
-                    '#content',
-                    '.main-content',
-                    '#main-content',
-                    '.post-content',
-                    '.article-content',
-                    '.entry-content',
-                    '.page-content',
-                    
-                    // Blog/CMS specific
-                    '.post-body',
-                    '.entry-body',
-                    '.article-body',
-                    '[itemprop="articleBody"]',
-                    
-                    // News sites
-                    '.story-body',
-                    '.story-content',
-                    '.news-content',
-                    
-                    // Generic fallbacks
-                    '.body',
-                    '#body',
-                    '[class*="content"]',
-                    '[id*="content"]'
-                ];
-
-                let mainContent = null;
-                let bestContentLength = 0;
-                
-                // First pass: try to find by semantic tags
-                for (const selector of contentSelectors) {
-                    const el = bodyClone.querySelector(selector);
-                    if (el) {
-                        const textLength = (el.textContent || '').length;
-                        // Prefer longer content if it's substantial
-                        if (textLength > bestContentLength && textLength > 500) {
-                            mainContent = el;
-                            bestContentLength = textLength;
-                        }
-                    }
-                }
+        # Extract title and main content in one evaluate, with aggressive element removal
+        data = await self.page.evaluate(_build_cleanup_js(self.CONTENT_SELECTORS)) or {}
+        return self._build_extracted_content(
+            data.get("title") or "", url, data.get("content") or "", max_length
+        )
 
-                // Second pass: if no good semantic content found, use heuristic scoring
-                if (!mainContent || bestContentLength < 500) {
-                    const candidates = bodyClone.querySelectorAll('div, section');
-                    let bestScore = 0;
-                    
-                    candidates.forEach(el => {
-                        const text = el.textContent || '';
-                        const textLength = text.length;
-                        const paragraphs = el.querySelectorAll('p').length;
-                        const links = el.querySelectorAll('a').length;
-                        const linkDensity = links > 0 ? textLength / links : textLength;
-                        
-                        // Score based on: text length, paragraph count, and link density
-                        // Higher score = more likely to be main content
-                        const score = (textLength * 0.5) + (paragraphs * 100) + (linkDensity * 0.3);
-                        
-                        if (score > bestScore && textLength > 300) {
-                            // Check it's not just a navigation container
-                            const className = (el.className || '').toLowerCase();
-                            const id = (el.id || '').toLowerCase();
-                            const isNavRelated = /nav|menu|sidebar|header|footer|comment|related|meta/.test(className + ' ' + id);
-                            
-                            if (!isNavRelated || paragraphs > 3) {
-                                bestScore = score;
-                                mainContent = el;
-                            }
-                        }
-                    });
-                }
+    async def _get_page_title(self) -> str:
+        """Get the page title."""
+        return await self.page.evaluate("document.title") or ""
 
-                // Final fallback to body if no main content found
-                if (!mainContent) {
-                    mainContent = bodyClone;
-                }
+    def _build_extracted_content(
+        self, title: str, url: str, text: str, max_length: int
+    ) -> ExtractedContent:
+        """Clean, truncate and summarize extracted text.
 
-                // Get text content and clean it up
-                let text = mainContent.innerText || mainContent.textContent || '';
-                
-                // Remove very short lines (likely UI elements)
-                const lines = text.split('\\n');
-                const filteredLines = lines.filter(line => {
-                    const trimmed = line.trim();
-                    return trimmed.length > 10 || (trimmed.length > 0 && trimmed.includes('.'));
-                });
-                text = filteredLines.join('\\n');
-                
-                // Clean up whitespace
-                text = text.replace(/\\s+/g, ' ').trim();
-                
-                // Remove standalone URLs
-                text = text.replace(/https?:\\/\\/[^\\s]+/g, '');
-                
-                return text;
-            }
-            """
-        )
+        Args:
+            title: Page title
+            url: Source URL
+            text: Raw extracted text
+            max_length: Maximum content length
 
+        Returns:
+            ExtractedContent object with clean text
+        """
         # Clean content with the improved cleaner
-        content = self._clean_content(content)
+        content = self._clean_content(text)
 
         # Truncate if needed
         if len(content) > max_length:
             content = content[:max_length].rsplit(" ", 1)[0] + "..."
 
-        word_count = len(content.split())
+        # _clean_content leaves single spaces between words and no edge whitespace, so
+        # counting separators gives the word count without building a list
+        word_count = content.count(" ") + 1 if content else 0
 
         # Generate summary if content is long
         summary = None
@@ -746,180 +1192,42 @@ class StealthSearchTools:
             title=title, url=url, content=content, summary=summary, word_count=word_count
         )
 
-    async def _get_page_title(self) -> str:
-        """Get the page title."""
-        return await self.page.evaluate("document.title") or ""
-
     def _clean_content(self, text: str) -> str:
         """Clean up extracted content with aggressive boilerplate removal."""
         if not text:
             return ""
 
-        import re
-
-        # Remove excess whitespace and normalize
-        text = re.sub(r"\s+", " ", text)
-        text = re.sub(r"\n\s*\n+", "\n\n", text)
-
-        # Remove social sharing and engagement prompts
-        social_patterns = [
-            r"Share this\s*(article|post|page)?\s*(on\s+\w+)?",
-            r"Share on\s+(Facebook|Twitter|LinkedIn|X|Instagram|Pinterest|Reddit)",
-            r"Follow us\s*(on\s+\w+)?",
-            r"Like us\s*(on\s+\w+)?",
-            r"Connect with us",
-            r"Join the conversation",
-            r"Leave a comment",
-            r"Add a comment",
-            r"Post a comment",
-            r"\d+\s*(likes?|shares?|comments?|reactions?)",
-        ]
-
-        for pattern in social_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove navigation and action prompts
-        action_patterns = [
-            r"Read more\s*(about this)?",
-            r"Click here\s*(to\s+\w+)?",
-            r"Learn more\s*(about)?",
-            r"Find out more",
-            r"Discover more",
-            r"See more",
-            r"View more",
-            r"Show more",
-            r"Expand\s*(for more)?",
-            r"Continue reading",
-            r"Skip to\s*(content|main|navigation)?",
-            r"Jump to\s*\w+",
-            r"Back to\s*(top|main|home)?",
-            r"Go back",
-            r"Next\s*(page|article|post)?",
-            r"Previous\s*(page|article|post)?",
-        ]
-
-        for pattern in action_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove subscription prompts
-        subscription_patterns = [
-            r"Subscribe\s*(to\s+\w+)?\s*(now)?",
-            r"Sign up\s*(for\s+\w+)?\s*(now)?",
-            r"Join\s*(our)?\s*(newsletter|list|community)",
-            r"Newsletter\s*(signup|sign-up|subscription)?",
-            r"Get\s+\w+\s+delivered\s+to\s+your\s+inbox",
-            r"Stay\s+(updated|informed|connected)",
-            r"Never\s+miss\s+(a|an)\s+\w+",
-        ]
-
-        for pattern in subscription_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove cookie and privacy notices
-        cookie_patterns = [
-            r"Cookie\s*(Policy|Notice|Settings|Consent|Banner)?",
-            r"This\s+site\s+uses\s+cookies",
-            r"We\s+use\s+cookies\s+(to\s+\w+)?",
-            r"By\s+(using|continuing|clicking)\s+.*?(you\s+agree|accept|consent)",
-            r"Accept\s*(all)?\s*cookies",
-            r"Cookie\s*preferences",
-            r"Privacy\s*(Policy|Notice|Settings)",
-            r"Terms\s*(of\s*Service|and\s*Conditions|of\s*Use)?",
-            r"GDPR\s*compliance",
-            r"California\s*Consumer\s*Privacy",
-            r"Do\s*Not\s*Sell\s*My\s*Information",
-        ]
-
-        for pattern in cookie_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove common navigation text
-        nav_patterns = [
-            r"Home\s*»?\s*",
-            r"Menu\s*" r"Navigation\s*",
-            r"Site\s*Map",
-            r"Sitemap",
-            r"Search\s*(this\s*site)?",
-            r"Quick\s*Links",
-            r"Related\s*(Links|Pages|Articles|Posts)?",
-            r"You\s*might\s*also\s*like",
-            r"Recommended\s*(for\s*you)?",
-            r"Popular\s*\w+",
-            r"Trending\s*\w+",
-            r"Most\s*(Read|Viewed|Popular)",
-        ]
-
-        for pattern in nav_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove ad-related text
-        ad_patterns = [
-            r"Advertisement\s*",
-            r"Ad\s*\d*\s*",
-            r"Sponsored\s*(content|post|link)?",
-            r"Promoted\s*(content|post)?",
-            r"Partner\s*content",
-            r"Paid\s*(content|partnership)?",
-            r"Affiliate\s*(link|disclosure)?",
-        ]
-
-        for pattern in ad_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove copyright and legal text
-        legal_patterns = [
-            r"©\s*\d{4}.*?(All\s+rights\s+reserved)?",
-            r"Copyright\s*©?\s*\d{4}",
-            r"All\s+rights\s+reserved",
-            r"Trademark\s*(notice)?",
-            r"Legal\s*(notice|disclaimer)",
-            r"Disclaimer",
-        ]
-
-        for pattern in legal_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove timestamps and dates that appear alone
-        date_patterns = [
-            r"\b\d{1,2}\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b",
-            r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
-            r"\b\d{1,2}/\d{1,2}/\d{2,4}\b",
-            r"\b\d{4}-\d{2}-\d{2}\b",
-            r"\d+\s+(minutes?|hours?|days?|weeks?|months?|years?)\s+ago",
-            r"Updated?\s*:?\s*.*\d{4}",
-            r"Published?\s*:?\s*.*\d{4}",
-        ]
-
-        for pattern in date_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        # Remove standalone short lines (likely navigation/UI elements)
-        lines = text.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            stripped = line.strip()
-            # Keep lines that are substantive (more than 3 words or longer than 30 chars)
-            if len(stripped.split()) > 3 or len(stripped) > 30:
-                cleaned_lines.append(stripped)
-            elif stripped and len(stripped) > 10:
-                # Check if it looks like a sentence
-                if stripped[0].isupper() and stripped[-1] in ".!?":
-                    cleaned_lines.append(stripped)
-
-        text = "\n".join(cleaned_lines)
+        # Remove excess whitespace and normalize; this also folds newlines, so from here
+        # on the text is a single line
+        text = _WHITESPACE_RE.sub(" ", text)
+
+        # Remove social, action, subscription, cookie, nav, ad, legal and date boilerplate
+        # Most pages contain few of these phrases, so a pattern is only scanned for when
+        # its literal prefix occurs. The folded copy is refreshed after a removal, since
+        # the text joined around it can form a new prefix
+        folded = _fold(text)
+        for prefix, pattern in _BOILERPLATE_TEXT_PATTERNS:
+            if prefix not in folded:
+                continue
+            text, removed = pattern.subn("", text)
+            if removed:
+                folded = _fold(text)
+        text = text.strip()
+
+        # Drop what is left if it is only a short UI fragment: keep text longer than
+        # 30 chars or 3 words, or a short sentence
+        if len(text) <= 30 and len(text.split()) <= 3:
+            if not (len(text) > 10 and text[0].isupper() and text[-1] in ".!?"):
+                return ""
 
         # Final cleanup
-        text = re.sub(r"\s+", " ", text)
-        text = re.sub(r"\n\s*\n+", "\n\n", text)
-
-        return text.strip()
+        return _WHITESPACE_RE.sub(" ", text).strip()
 
     def _generate_summary(self, text: str, sentences: int = 3) -> str:
         """Generate a simple summary by extracting first N sentences."""
-        import re
-
-        # Split into sentences
-        sentences_list = re.split(r"(?<=[.!?])\s+", text)
+        # Split off only the first N sentences; maxsplit stops the scan there instead of
+        # tokenizing the whole document
+        sentences_list = _SENTENCE_END_RE.split(text, maxsplit=sentences)
 
         # Take first N sentences
         summary_sentences = sentences_list[:sentences]
@@ -949,6 +1257,9 @@ async def stealth_search(
     Returns:
         SearchResponse object containing results and optional AI summary
     """
+    # Reject bad input before acquiring a sub-agent browser
+    StealthSearchTools.validate_search_params(query, count, page_num)
+
     if session_id and manager:
         # Use sub-agent browser
         browser_instance = await manager.get_or_create_browser(session_id)
@@ -17,6 +17,8 @@ import pytest
 import pytest_asyncio
 
 from src.browser.manager import BrowserManager
+from src.server import StealthBrowserServer
+from src.tools.stealth_search import StealthSearchTools
 
 
 def is_ci():
@@ -24,10 +26,29 @@ def is_ci():
     return os.environ.get("CI", "").lower() in ("true", "1")
 
 
+@pytest.fixture(autouse=True)
+def clear_extract_cache():
+    """Start every test with an empty extract() cache."""
+    StealthSearchTools.clear_extract_cache()
+    yield
+    StealthSearchTools.clear_extract_cache()
+
+
+@pytest.fixture
+def server():
+    """Create a server instance with mocked components."""
+    with patch("src.server.BrowserManager"):
+        server = StealthBrowserServer()
+        server.browser_manager = MagicMock()
+        server.browser_manager.page = AsyncMock()
+        server.browser_manager.subagent_manager = None
+        return server
+
+
 @pytest_asyncio.fixture
 async def browser_manager():
     """Browser manager fixture.
-    
+
     In CI: Uses mock to avoid hanging on real browser launch.
     Locally: Uses real browser for integration testing.
     """
@@ -5,6 +5,8 @@ Tests for AI Summary extraction feature.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from pydantic import ValidationError
+
 from src.tools.stealth_search import (
     AISummary,
     SearchResponse,
@@ -74,6 +76,15 @@ class TestSearchResponseModel:
         assert len(response.results) == 0
         assert response.ai_summary.text == "Summary only"
 
+    def test_search_models_are_immutable(self):
+        """Test that result models are frozen and reject unknown fields."""
+        result = SearchResult(title="T", url="https://example.com", snippet="S", position=1)
+
+        with pytest.raises(ValidationError):
+            result.title = "changed"
+        with pytest.raises(ValidationError):
+            SearchResult(title="T", url="u", snippet="s", position=1, rank=5)
+
 
 class TestAISummaryExtraction:
     """Test suite for AI summary extraction from page."""
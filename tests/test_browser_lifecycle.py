@@ -25,6 +25,17 @@ class TestBrowserInstance:
         assert instance.is_active is True
         assert instance._closed is False
 
+    async def test_stats_report_wall_clock_activity(self):
+        """Test that get_stats reports last activity as a wall-clock timestamp."""
+        instance = BrowserInstance("test-session", MagicMock(), AsyncMock())
+        before = time.time()
+        instance.update_activity()
+
+        stats = instance.get_stats()
+
+        assert before <= stats["last_activity"] <= time.time()
+        assert 0 <= stats["idle_seconds"] < 1
+
     async def test_create_tab(self):
         """Test tab creation and tracking."""
         mock_browser = MagicMock()
@@ -159,3 +170,36 @@ class TestSubAgentBrowserManager:
         
         assert "sub-idle" not in manager._browsers
         mock_browser.close.assert_called()
+
+    async def test_cleanup_drops_entries_of_recreated_session(self, manager):
+        """Test that a closed and re-created session leaves no stale expiry entry."""
+        manager._playwright.chromium.launch.return_value = AsyncMock()
+        manager.IDLE_TIMEOUT_SECONDS = 0.05
+
+        await manager.create_browser("sub-again")
+        await manager.close_browser("sub-again")
+        instance = await manager.create_browser("sub-again")
+
+        await asyncio.sleep(0.1)
+        instance.update_activity()
+        await manager._cleanup_inactive()
+
+        # The old instance's entry is dropped; only the live instance is re-armed
+        assert manager._browsers["sub-again"] is instance
+        assert [entry[3] for entry in manager._expiry_heap] == [instance]
+
+    async def test_close_browser_reuses_pooled_process(self, manager):
+        """Test that a closed session's browser is reused with a fresh context."""
+        mock_browser = AsyncMock()
+        manager._playwright.chromium.launch.return_value = mock_browser
+
+        await manager.create_browser("sub-a")
+        assert await manager.close_browser("sub-a") is True
+        assert manager._browser_pool == [mock_browser]
+        mock_browser.close.assert_not_called()
+
+        await manager.create_browser("sub-b")
+
+        manager._playwright.chromium.launch.assert_called_once()
+        assert mock_browser.new_context.call_count == 2
+        assert manager._browser_pool == []
@@ -11,28 +11,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.tools.stealth_search import StealthSearchTools, ExtractedContent
-
-
-class TestBrowserParity:
-    """Test suite for browser vs MCP server content parity."""
-
-    @pytest.fixture
-    def mock_page(self):
-        """Create a mock Playwright page with realistic content."""
-        page = AsyncMock()
-        page.goto = AsyncMock()
-        page.wait_for_timeout = AsyncMock()
-        page.content = AsyncMock()
-        page.evaluate = AsyncMock()
-        page.query_selector = AsyncMock(return_value=None)
-        return page
-
-    @pytest.mark.asyncio
-    async def test_extract_matches_browser_visible_text(self, mock_page):
-        """Test that extraction matches what's visible in browser."""
-        # Simulate a Wikipedia-like page with main content
-        mock_page.content.return_value = """
+from src.tools.stealth_search import (
+    RESILIPARSE_AVAILABLE,
+    TRAFILATURA_AVAILABLE,
+    StealthSearchTools,
+    ExtractedContent,
+    _prune_boilerplate,
+)
+
+# Page HTML per scenario, shared by the parity tests
+_HTML_FIXTURES = {
+    "matches_browser_visible_text": """
         <html>
             <head><title>Python (programming language) - Wikipedia</title></head>
             <body>
@@ -50,32 +39,8 @@ class TestBrowserParity:
                 <div class="cookie-banner">Accept cookies?</div>
             </body>
         </html>
-        """
-
-        # Mock evaluate to return the main article content (simulating JS extraction)
-        mock_page.evaluate.return_value = (
-            "Python (programming language) Python is a high-level, general-purpose "
-            "programming language. Its design philosophy emphasizes code readability "
-            "with the use of significant indentation. Python is dynamically typed and "
-            "garbage-collected. It supports multiple programming paradigms, including "
-            "structured, object-oriented and functional programming."
-        )
-
-        tools = StealthSearchTools(mock_page)
-        result = await tools.extract("https://en.wikipedia.org/wiki/Python", max_length=5000)
-
-        # Validate extraction matches browser-visible content
-        assert "python" in result.title.lower()
-        assert "high-level" in result.content or "general-purpose" in result.content
-        assert "code readability" in result.content or "programming" in result.content
-
-        # Validate main content is present
-        assert len(result.content) > 50, "Should extract meaningful content"
-
-    @pytest.mark.asyncio
-    async def test_extract_removes_navigation_elements(self, mock_page):
-        """Test that navigation, footers, and sidebars are removed."""
-        mock_page.content.return_value = """
+        """,
+    "removes_navigation_elements": """
         <html>
             <body>
                 <nav class="main-nav">
@@ -98,55 +63,211 @@ class TestBrowserParity:
                 </footer>
             </body>
         </html>
-        """
+        """,
+    "removes_social_sharing": """
+        <html>
+            <body>
+                <article>
+                    <h1>Tech News Article</h1>
+                    <div class="share-buttons">
+                        <button>Share on Twitter</button>
+                        <button>Share on Facebook</button>
+                        <button>Share on LinkedIn</button>
+                    </div>
+                    <p>This is the actual article content about technology.</p>
+                    <p>Follow us on social media for more updates!</p>
+                </article>
+            </body>
+        </html>
+        """,
+    "removes_cookie_gdpr_notices": """
+        <html>
+            <body>
+                <div class="cookie-consent">
+                    <p>We use cookies to improve your experience. By continuing to 
+                    browse this site, you agree to our use of cookies.</p>
+                    <button>Accept All Cookies</button>
+                    <button>Cookie Settings</button>
+                </div>
+                <main>
+                    <h1>Article About Data Privacy</h1>
+                    <p>Data privacy is an important topic in the modern digital age.</p>
+                    <p>Organizations must comply with GDPR and other regulations.</p>
+                </main>
+            </body>
+        </html>
+        """,
+    "removes_subscription_prompts": """
+        <html>
+            <body>
+                <article>
+                    <h1>Premium Content Article</h1>
+                    <p>This article provides valuable insights on the topic.</p>
+                </article>
+                <div class="newsletter-signup">
+                    <h3>Subscribe to our Newsletter</h3>
+                    <p>Get the latest articles delivered to your inbox!</p>
+                    <input type="email" placeholder="Enter your email">
+                    <button>Sign Up Now</button>
+                </div>
+                <div class="paywall">
+                    <p>Subscribe to read the full article.</p>
+                    <button>Start Free Trial</button>
+                </div>
+            </body>
+        </html>
+        """,
+    "handles_code_blocks": """
+        <html>
+            <body>
+                <article>
+                    <h1>Python Tutorial</h1>
+                    <p>Here's how to define a function in Python:</p>
+                    <pre><code>
+def greet(name):
+    print(f"Hello, {name}!")
+                    </code></pre>
+                    <p>This function takes a name parameter and prints a greeting.</p>
+                </article>
+            </body>
+        </html>
+        """,
+    "word_count_accuracy": """
+        <html>
+            <body>
+                <main>
+                    <h1>Short Article</h1>
+                    <p>This is a brief article with exactly ten words here now.</p>
+                </main>
+                <footer>
+                    <p>Subscribe Follow Share Like Comment Contact About Privacy Terms 
+                    Cookie GDPR Copyright 2024 All Rights Reserved Legal Disclaimer</p>
+                </footer>
+            </body>
+        </html>
+        """,
+    "preserves_article_structure": """
+        <html>
+            <body>
+                <article>
+                    <h1>Main Title</h1>
+                    <h2>Section 1</h2>
+                    <p>Content of section 1.</p>
+                    <h2>Section 2</h2>
+                    <p>Content of section 2.</p>
+                    <h3>Subsection 2.1</h3>
+                    <p>Content of subsection 2.1.</p>
+                </article>
+            </body>
+        </html>
+        """,
+    "uses_resiliparse_fast_path": """
+        <html>
+            <head><title>Fast Path Article</title></head>
+            <body>
+                <nav>Home | About</nav>
+                <article><p>Resiliparse extracts the main article text directly.</p></article>
+            </body>
+        </html>
+        """,
+}
+
+
+@pytest.fixture(scope="module")
+def shared_page():
+    """Create a mock Playwright page once per module."""
+    page = AsyncMock()
+    page.goto = AsyncMock()
+    page.wait_for_timeout = AsyncMock()
+    page.content = AsyncMock()
+    page.evaluate = AsyncMock()
+    page.query_selector = AsyncMock()
+    return page
 
-        mock_page.evaluate.return_value = (
-            "Main Article Title This is the main content that should be preserved. "
-            "It contains important information about the topic."
-        )
+
+class TestBrowserParity:
+    """Test suite for browser vs MCP server content parity."""
+
+    @pytest.fixture
+    def mock_page(self, shared_page):
+        """Reset the shared mock page so each test configures it from a clean state."""
+        shared_page.reset_mock(return_value=True, side_effect=True)
+        shared_page.query_selector.return_value = None
+        return shared_page
+
+    @pytest.mark.asyncio
+    async def test_extract_matches_browser_visible_text(self, mock_page):
+        """Test that extraction matches what's visible in browser."""
+        # Simulate a Wikipedia-like page with main content
+        mock_page.content.return_value = _HTML_FIXTURES["matches_browser_visible_text"]
+
+        # Mock evaluate to return the main article content (simulating JS extraction)
+        mock_page.evaluate.return_value = {
+            "title": "Python (programming language) - Wikipedia",
+            "content": (
+                "Python (programming language) Python is a high-level, general-purpose "
+                "programming language. Its design philosophy emphasizes code readability "
+                "with the use of significant indentation. Python is dynamically typed and "
+                "garbage-collected. It supports multiple programming paradigms, including "
+                "structured, object-oriented and functional programming."
+            ),
+        }
+
+        tools = StealthSearchTools(mock_page)
+        result = await tools.extract("https://en.wikipedia.org/wiki/Python", max_length=5000)
+
+        # Validate extraction matches browser-visible content
+        assert "python" in result.title.lower()
+        assert "high-level" in result.content or "general-purpose" in result.content
+        assert "code readability" in result.content or "programming" in result.content
+
+        # Validate main content is present
+        assert len(result.content) > 50, "Should extract meaningful content"
+
+    @pytest.mark.asyncio
+    async def test_extract_removes_navigation_elements(self, mock_page):
+        """Test that navigation, footers, and sidebars are removed."""
+        mock_page.content.return_value = _HTML_FIXTURES["removes_navigation_elements"]
+
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Main Article Title This is the main content that should be preserved. "
+                "It contains important information about the topic."
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/article", max_length=5000)
+        content_lower = result.content.lower()
 
         # Main content should be preserved
-        assert "main content that should be preserved" in result.content.lower()
-        assert "important information about the topic" in result.content.lower()
+        assert "main content that should be preserved" in content_lower
+        assert "important information about the topic" in content_lower
 
         # Navigation should be removed
-        assert "home" not in result.content.lower() or "home" not in result.content[:100]
+        assert "home" not in content_lower or "home" not in result.content[:100]
 
         # Footer content should be removed/minimized
-        assert "copyright 2024" not in result.content.lower()
+        assert "copyright 2024" not in content_lower
 
         # Sidebar should not dominate
         sidebar_keywords = ["related articles", "article 1", "article 2"]
-        sidebar_presence = sum(1 for kw in sidebar_keywords if kw in result.content.lower())
+        sidebar_presence = sum(1 for kw in sidebar_keywords if kw in content_lower)
         assert sidebar_presence < 2, "Sidebar content should be minimized"
 
     @pytest.mark.asyncio
     async def test_extract_removes_social_sharing(self, mock_page):
         """Test that social sharing buttons and prompts are removed."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <article>
-                    <h1>Tech News Article</h1>
-                    <div class="share-buttons">
-                        <button>Share on Twitter</button>
-                        <button>Share on Facebook</button>
-                        <button>Share on LinkedIn</button>
-                    </div>
-                    <p>This is the actual article content about technology.</p>
-                    <p>Follow us on social media for more updates!</p>
-                </article>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["removes_social_sharing"]
 
-        mock_page.evaluate.return_value = (
-            "Tech News Article This is the actual article content about technology. "
-            "Follow us on social media for more updates!"
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Tech News Article This is the actual article content about technology. "
+                "Follow us on social media for more updates!"
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/news", max_length=5000)
@@ -163,38 +284,25 @@ class TestBrowserParity:
     @pytest.mark.asyncio
     async def test_extract_removes_cookie_gdpr_notices(self, mock_page):
         """Test that cookie consent and GDPR notices are removed."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <div class="cookie-consent">
-                    <p>We use cookies to improve your experience. By continuing to 
-                    browse this site, you agree to our use of cookies.</p>
-                    <button>Accept All Cookies</button>
-                    <button>Cookie Settings</button>
-                </div>
-                <main>
-                    <h1>Article About Data Privacy</h1>
-                    <p>Data privacy is an important topic in the modern digital age.</p>
-                    <p>Organizations must comply with GDPR and other regulations.</p>
-                </main>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["removes_cookie_gdpr_notices"]
 
-        mock_page.evaluate.return_value = (
-            "Article About Data Privacy Data privacy is an important topic in the "
-            "modern digital age. Organizations must comply with GDPR and other regulations."
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Article About Data Privacy Data privacy is an important topic in the "
+                "modern digital age. Organizations must comply with GDPR and other regulations."
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/privacy", max_length=5000)
+        content_lower = result.content.lower()
 
         # Main content preserved
-        assert "data privacy is an important topic" in result.content.lower()
-        assert "gdpr and other regulations" in result.content.lower()
+        assert "data privacy is an important topic" in content_lower
+        assert "gdpr and other regulations" in content_lower
 
         # Cookie notice cleaned
-        content_lower = result.content.lower()
         assert "we use cookies to improve" not in content_lower
         assert "accept all cookies" not in content_lower
         assert "cookie settings" not in content_lower
@@ -202,32 +310,16 @@ class TestBrowserParity:
     @pytest.mark.asyncio
     async def test_extract_removes_subscription_prompts(self, mock_page):
         """Test that subscription and newsletter prompts are removed."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <article>
-                    <h1>Premium Content Article</h1>
-                    <p>This article provides valuable insights on the topic.</p>
-                </article>
-                <div class="newsletter-signup">
-                    <h3>Subscribe to our Newsletter</h3>
-                    <p>Get the latest articles delivered to your inbox!</p>
-                    <input type="email" placeholder="Enter your email">
-                    <button>Sign Up Now</button>
-                </div>
-                <div class="paywall">
-                    <p>Subscribe to read the full article.</p>
-                    <button>Start Free Trial</button>
-                </div>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["removes_subscription_prompts"]
 
-        mock_page.evaluate.return_value = (
-            "Premium Content Article This article provides valuable insights on the topic. "
-            "Subscribe to our Newsletter Get the latest articles delivered to your inbox! "
-            "Subscribe to read the full article."
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Premium Content Article This article provides valuable insights on the topic. "
+                "Subscribe to our Newsletter Get the latest articles delivered to your inbox! "
+                "Subscribe to read the full article."
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/premium", max_length=5000)
@@ -243,57 +335,35 @@ class TestBrowserParity:
     @pytest.mark.asyncio
     async def test_extract_handles_code_blocks(self, mock_page):
         """Test that code blocks are preserved in technical content."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <article>
-                    <h1>Python Tutorial</h1>
-                    <p>Here's how to define a function in Python:</p>
-                    <pre><code>
-def greet(name):
-    print(f"Hello, {name}!")
-                    </code></pre>
-                    <p>This function takes a name parameter and prints a greeting.</p>
-                </article>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["handles_code_blocks"]
 
-        mock_page.evaluate.return_value = (
-            "Python Tutorial Here's how to define a function in Python: "
-            'def greet(name): print(f"Hello, {name}!") '
-            "This function takes a name parameter and prints a greeting."
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Python Tutorial Here's how to define a function in Python: "
+                'def greet(name): print(f"Hello, {name}!") '
+                "This function takes a name parameter and prints a greeting."
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/python", max_length=5000)
+        content_lower = result.content.lower()
 
         # Code-related content preserved
-        assert "def greet" in result.content or "function" in result.content.lower()
-        assert "python" in result.content.lower()
+        assert "def greet" in result.content or "function" in content_lower
+        assert "python" in content_lower
 
     @pytest.mark.asyncio
     async def test_word_count_accuracy(self, mock_page):
         """Test that word count reflects actual content, not noise."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <main>
-                    <h1>Short Article</h1>
-                    <p>This is a brief article with exactly ten words here now.</p>
-                </main>
-                <footer>
-                    <p>Subscribe Follow Share Like Comment Contact About Privacy Terms 
-                    Cookie GDPR Copyright 2024 All Rights Reserved Legal Disclaimer</p>
-                </footer>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["word_count_accuracy"]
 
         # Main content only - 10 words
-        mock_page.evaluate.return_value = (
-            "Short Article This is a brief article with exactly ten words here now."
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": "Short Article This is a brief article with exactly ten words here now.",
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/short", max_length=5000)
@@ -305,35 +375,279 @@ def greet(name):
     @pytest.mark.asyncio
     async def test_extract_preserves_article_structure(self, mock_page):
         """Test that article headings and paragraphs maintain structure."""
-        mock_page.content.return_value = """
-        <html>
-            <body>
-                <article>
-                    <h1>Main Title</h1>
-                    <h2>Section 1</h2>
-                    <p>Content of section 1.</p>
-                    <h2>Section 2</h2>
-                    <p>Content of section 2.</p>
-                    <h3>Subsection 2.1</h3>
-                    <p>Content of subsection 2.1.</p>
-                </article>
-            </body>
-        </html>
-        """
+        mock_page.content.return_value = _HTML_FIXTURES["preserves_article_structure"]
 
-        mock_page.evaluate.return_value = (
-            "Main Title Section 1 Content of section 1. Section 2 Content of section 2. "
-            "Subsection 2.1 Content of subsection 2.1."
-        )
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": (
+                "Main Title Section 1 Content of section 1. Section 2 Content of section 2. "
+                "Subsection 2.1 Content of subsection 2.1."
+            ),
+        }
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://example.com/structured", max_length=5000)
+        content_lower = result.content.lower()
 
         # All sections should be present
-        assert "main title" in result.content.lower()
-        assert "section 1" in result.content.lower()
-        assert "section 2" in result.content.lower()
-        assert "subsection 2.1" in result.content.lower()
+        assert "main title" in content_lower
+        assert "section 1" in content_lower
+        assert "section 2" in content_lower
+        assert "subsection 2.1" in content_lower
+
+    @pytest.mark.skipif(not RESILIPARSE_AVAILABLE, reason="resiliparse not installed")
+    @pytest.mark.asyncio
+    async def test_extract_uses_resiliparse_fast_path(self, mock_page):
+        """Test that Resiliparse extraction is used from page HTML when installed."""
+        mock_page.content.return_value = _HTML_FIXTURES["uses_resiliparse_fast_path"]
+
+        tools = StealthSearchTools(mock_page)
+        result = await tools.extract("https://example.com/fast", max_length=5000)
+
+        assert result.title == "Fast Path Article"
+        assert "main article text" in result.content
+        mock_page.evaluate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_js_path_skips_page_content(self, mock_page):
+        """Test that without HTML extractors only the single JS evaluate is issued."""
+        mock_page.evaluate.return_value = {
+            "title": "JS Title",
+            "content": "This content came from the in-page cleanup script only.",
+        }
+
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+        ):
+            tools = StealthSearchTools(mock_page)
+            result = await tools.extract("https://example.com/js", max_length=5000)
+
+        assert result.title == "JS Title"
+        mock_page.content.assert_not_called()
+        mock_page.evaluate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_extract_waits_for_network_idle(self, mock_page):
+        """Test that extract settles on network idle rather than a fixed sleep."""
+        mock_page.evaluate.return_value = {
+            "title": "Idle Title",
+            "content": "This content was read once the network went idle.",
+        }
+
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+        ):
+            tools = StealthSearchTools(mock_page)
+            await tools.extract("https://example.com/idle", max_length=5000)
+
+        mock_page.wait_for_load_state.assert_awaited_once_with("networkidle")
+        mock_page.wait_for_timeout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_caps_network_idle_wait(self, mock_page):
+        """Test that a page that never goes idle is still extracted."""
+        mock_page.evaluate.return_value = {
+            "title": "Busy Title",
+            "content": "This page keeps polling but its content is already there.",
+        }
+
+        async def never_idle(state):
+            await asyncio.sleep(3600)
+
+        mock_page.wait_for_load_state.side_effect = never_idle
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+            patch.object(StealthSearchTools, "NETWORK_IDLE_TIMEOUT", 0.01),
+        ):
+            tools = StealthSearchTools(mock_page)
+            result = await asyncio.wait_for(
+                tools.extract("https://example.com/busy", max_length=5000), timeout=5
+            )
+
+        assert result.title == "Busy Title"
+
+    @pytest.mark.asyncio
+    async def test_extract_reuses_cached_result(self, mock_page):
+        """Test that a repeat extract of the same URL skips navigation until the TTL lapses."""
+        mock_page.evaluate.return_value = {
+            "title": "Cached Title",
+            "content": "This content should only be extracted once per TTL window.",
+        }
+
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+            patch("src.tools.stealth_search.time.monotonic") as mock_clock,
+        ):
+            mock_clock.return_value = 1000.0
+            first = await StealthSearchTools(mock_page).extract("https://example.com/cached")
+            second = await StealthSearchTools(mock_page).extract("https://example.com/cached")
+            assert second is first
+            assert mock_page.goto.await_count == 1
+
+            # A different max_length is a different key
+            await StealthSearchTools(mock_page).extract("https://example.com/cached", 100)
+            assert mock_page.goto.await_count == 2
+
+            mock_clock.return_value = 1000.0 + StealthSearchTools.EXTRACT_CACHE_TTL
+            await StealthSearchTools(mock_page).extract("https://example.com/cached")
+            assert mock_page.goto.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_extract_cache_is_scoped_and_can_be_bypassed(self, mock_page):
+        """Test that cache scopes never share results and use_cache=False always navigates."""
+        mock_page.evaluate.return_value = {
+            "title": "Scoped Title",
+            "content": "This content depends on the cookies of the calling session.",
+        }
+
+        url = "https://example.com/account"
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+        ):
+            first = await StealthSearchTools(mock_page, cache_scope="session-a").extract(url)
+            await StealthSearchTools(mock_page, cache_scope="session-b").extract(url)
+            await StealthSearchTools(mock_page).extract(url)
+            assert mock_page.goto.await_count == 3
+
+            again = await StealthSearchTools(mock_page, cache_scope="session-a").extract(url)
+            assert again is first
+            assert mock_page.goto.await_count == 3
+
+            fresh = await StealthSearchTools(mock_page, cache_scope="session-a").extract(
+                url, use_cache=False
+            )
+            assert fresh is not first
+            assert mock_page.goto.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_extract_revalidates_expired_entry(self, mock_page, monkeypatch):
+        """Test that an expired entry is reused when the server answers 304 Not Modified."""
+        mock_page.evaluate.return_value = {
+            "title": "Validated Title",
+            "content": "This content carries an ETag and a Last-Modified date.",
+        }
+        mock_page.goto.return_value = MagicMock(
+            headers={"etag": '"v1"', "last-modified": "Tue, 01 Oct 2024 10:00:00 GMT"}
+        )
+        not_modified = MagicMock(status=304, dispose=AsyncMock())
+        request_get = AsyncMock(return_value=not_modified)
+        monkeypatch.setattr(mock_page, "context", MagicMock(request=MagicMock(get=request_get)))
+
+        url = "https://example.com/validated"
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+            patch("src.tools.stealth_search.time.monotonic") as mock_clock,
+        ):
+            mock_clock.return_value = 1000.0
+            first = await StealthSearchTools(mock_page).extract(url)
+
+            mock_clock.return_value = 1000.0 + StealthSearchTools.EXTRACT_CACHE_TTL
+            assert await StealthSearchTools(mock_page).extract(url) is first
+            assert mock_page.goto.await_count == 1
+            request_get.assert_awaited_once_with(
+                url,
+                headers={
+                    "If-None-Match": '"v1"',
+                    "If-Modified-Since": "Tue, 01 Oct 2024 10:00:00 GMT",
+                },
+                timeout=10000,
+            )
+            not_modified.dispose.assert_awaited_once()
+
+            # The 304 started a new TTL window; once that lapses a changed page is reloaded
+            mock_clock.return_value = 1000.0 + 2 * StealthSearchTools.EXTRACT_CACHE_TTL
+            not_modified.status = 200
+            assert await StealthSearchTools(mock_page).extract(url) is not first
+            assert mock_page.goto.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_extract_many_uses_one_page_per_url(self, mock_page, monkeypatch):
+        """Test that extract_many keeps URL order, isolates failures and closes pages."""
+        worker_pages = []
+
+        async def new_page():
+            worker = AsyncMock()
+            worker.evaluate.return_value = {
+                "title": f"Page {len(worker_pages)}",
+                "content": "This content came from a dedicated extraction page.",
+            }
+            if len(worker_pages) == 1:
+                worker.goto.side_effect = Exception("net::ERR_NAME_NOT_RESOLVED")
+            worker_pages.append(worker)
+            return worker
+
+        monkeypatch.setattr(
+            mock_page, "context", MagicMock(new_page=AsyncMock(side_effect=new_page))
+        )
+
+        urls = ["https://example.com/a", "https://bad.invalid/", "https://example.com/c"]
+        with (
+            patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False),
+            patch("src.tools.stealth_search.TRAFILATURA_AVAILABLE", False),
+        ):
+            tools = StealthSearchTools(mock_page)
+            results = await tools.extract_many(urls, concurrency=2)
+
+        assert [r.url if r else None for r in results] == [urls[0], None, urls[2]]
+        assert len(worker_pages) == 3
+        for worker in worker_pages:
+            worker.close.assert_awaited_once()
+        mock_page.goto.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_extract_many_rejects_zero_concurrency(self, mock_page):
+        """Test that extract_many requires at least one worker."""
+        tools = StealthSearchTools(mock_page)
+        with pytest.raises(ValueError, match="concurrency"):
+            await tools.extract_many(["https://example.com"], concurrency=0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not TRAFILATURA_AVAILABLE, reason="trafilatura/lxml not installed")
+    async def test_extract_falls_back_to_document_title(self, mock_page):
+        """Test that pages without title metadata take the title from document.title."""
+        paragraph = "Substantial article text about extraction without any metadata. " * 10
+        mock_page.content.return_value = (
+            f"<html><body><article><p>{paragraph}</p></article></body></html>"
+        )
+        mock_page.evaluate.return_value = "Document Title"
+
+        tools = StealthSearchTools(mock_page)
+        result = await tools.extract("https://example.com/untitled")
+
+        assert result.title == "Document Title"
+        assert "Substantial article text" in result.content
+        mock_page.evaluate.assert_awaited_once_with("document.title")
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not TRAFILATURA_AVAILABLE, reason="trafilatura/lxml not installed")
+    async def test_extract_keeps_heading_and_lead(self, mock_page):
+        """Test that an article's heading and lead survive boilerplate pruning."""
+        body = "The council approved the new transit plan after a long debate. " * 8
+        mock_page.content.return_value = f"""
+            <html><head><title>City News</title></head><body>
+                <article>
+                    <h1 class="entry-head-line">Council Approves Transit Plan</h1>
+                    <p class="lead-paragraph">Three new bus lines open next spring.</p>
+                    <p>{body}</p>
+                </article>
+                <div class="ad-slot">Buy now</div>
+            </body></html>
+            """
+
+        tools = StealthSearchTools(mock_page)
+        # Exercise the trafilatura path, where the pruning runs
+        with patch("src.tools.stealth_search.RESILIPARSE_AVAILABLE", False):
+            result = await tools.extract("https://example.com/transit")
+
+        assert "Council Approves Transit Plan" in f"{result.title} {result.content}"
+        assert "Three new bus lines" in result.content
+        assert "Buy now" not in result.content
 
 
 class TestContentCleaningAccuracy:
@@ -345,6 +659,26 @@ class TestContentCleaningAccuracy:
         mock_page = AsyncMock()
         return StealthSearchTools(mock_page)
 
+    def test_clean_applies_patterns_in_order(self, tools):
+        """Test that boilerplate patterns run one after another, as they always have."""
+        # "Click here ..." is removed before "Popular\s*\w+" can consume "Click"
+        assert tools._clean_content("Popular Click here to quick 3 Menu") == ""
+        # Dates are removed before "Published: ... 2024" can match across them
+        assert (
+            tools._clean_content(
+                "Back to top Published: March 3, 2024 council approved the transit plan today"
+            )
+            == "Published: council approved the transit plan today"
+        )
+
+    def test_clean_prefilter_keeps_every_match(self, tools):
+        """Test that skipping patterns by literal prefix never skips a real match."""
+        body = "the council approved the new transit plan after a long debate"
+        # IGNORECASE matches dotless ı as i, which casefold() alone would miss
+        assert tools._clean_content(f"Lıke us on Facebook {body}") == body
+        # Removing "Ad" joins "Disc" and "laimer" into a phrase a later legal pattern drops
+        assert tools._clean_content(f"DiscAdlaimer {body}") == body
+
     def test_clean_removes_excess_whitespace(self, tools):
         """Test that excess whitespace is normalized."""
         dirty = "This   has    too     much      whitespace."
@@ -358,11 +692,12 @@ class TestContentCleaningAccuracy:
         """Test that text is properly normalized."""
         dirty = "Check out https://example.com for more info"
         clean = tools._clean_content(dirty)
+        clean_lower = clean.lower()
 
         # The cleaner normalizes whitespace and removes some patterns
         # URLs are handled in JS extraction, not in _clean_content
         assert len(clean) > 0, "Content should not be empty"
-        assert "check out" in clean.lower() or "more info" in clean.lower()
+        assert "check out" in clean_lower or "more info" in clean_lower
 
     def test_clean_preserves_meaningful_content(self, tools):
         """Test that meaningful content is not over-cleaned."""
@@ -371,11 +706,63 @@ class TestContentCleaningAccuracy:
             "The name comes from Monty Python's Flying Circus."
         )
         clean = tools._clean_content(original)
+        clean_lower = clean.lower()
 
         # Key phrases should remain
-        assert "programming language" in clean.lower()
-        assert "guido van rossum" in clean.lower() or "created by" in clean.lower()
-        assert "monty python" in clean.lower()
+        assert "programming language" in clean_lower
+        assert "guido van rossum" in clean_lower or "created by" in clean_lower
+        assert "monty python" in clean_lower
+
+    @pytest.mark.skipif(not TRAFILATURA_AVAILABLE, reason="trafilatura/lxml not installed")
+    def test_prune_boilerplate_removes_short_widgets_only(self):
+        """Test that nav/footer and short cookie/social blocks are pruned from the tree."""
+        from lxml import html
+
+        long_text = "Substantial article text that must survive pruning. " * 10
+        tree = html.fromstring(f"""
+            <html><body class="cookie-consent-shown">
+                <nav>Home | About</nav>
+                <div class="cookie-banner">Accept cookies?</div>
+                <div class="social-links">Share on Twitter</div>
+                <article class="social-story"><p>{long_text}</p></article>
+                <footer>Privacy Policy</footer>
+            </body></html>
+            """)
+
+        _prune_boilerplate(tree)
+        text = tree.text_content()
+
+        assert "Home | About" not in text
+        assert "Accept cookies?" not in text
+        assert "Share on Twitter" not in text
+        assert "Privacy Policy" not in text
+        assert "Substantial article text" in text
+
+    @pytest.mark.skipif(not TRAFILATURA_AVAILABLE, reason="trafilatura/lxml not installed")
+    def test_prune_boilerplate_matches_whole_class_tokens(self):
+        """Test that classes merely containing "ad-"/"share" letters are not pruned."""
+        from lxml import html
+
+        tree = html.fromstring("""
+            <html><body>
+                <h1 class="entry-head-line">Headline</h1>
+                <p class="lead-paragraph">Lead paragraph.</p>
+                <div class="thread-list">Thread list.</div>
+                <div class="ad-slot">Buy now</div>
+                <div class="ads">Sponsored</div>
+                <div class="share-buttons">Share this</div>
+            </body></html>
+            """)
+
+        _prune_boilerplate(tree)
+        text = tree.text_content()
+
+        assert "Headline" in text
+        assert "Lead paragraph." in text
+        assert "Thread list." in text
+        assert "Buy now" not in text
+        assert "Sponsored" not in text
+        assert "Share this" not in text
 
     def test_summary_generation(self, tools):
         """Test that summary captures first sentences."""
@@ -422,17 +809,21 @@ class TestBrowserVsExtractionParity:
         mock_page.content.return_value = (
             f"<html><body><article>{browser_visible}</article></body></html>"
         )
-        mock_page.evaluate.return_value = " ".join(browser_visible.split())
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": " ".join(browser_visible.split()),
+        }
         mock_page.query_selector = AsyncMock(return_value=None)
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://news.example.com/article", max_length=5000)
+        content_lower = result.content.lower()
 
         # Validate key content is preserved
-        assert "tech company" in result.content.lower()
-        assert "new product" in result.content.lower()
-        assert "artificial intelligence" in result.content.lower()
-        assert "ceo" in result.content.lower() or "jane doe" in result.content.lower()
+        assert "tech company" in content_lower
+        assert "new product" in content_lower
+        assert "artificial intelligence" in content_lower
+        assert "ceo" in content_lower or "jane doe" in content_lower
 
     @pytest.mark.asyncio
     async def test_documentation_page_parity(self):
@@ -464,13 +855,17 @@ class TestBrowserVsExtractionParity:
         mock_page.goto = AsyncMock()
         mock_page.wait_for_timeout = AsyncMock()
         mock_page.content.return_value = f"<html><body><main>{browser_visible}</main></body></html>"
-        mock_page.evaluate.return_value = " ".join(browser_visible.split())
+        mock_page.evaluate.return_value = {
+            "title": "",
+            "content": " ".join(browser_visible.split()),
+        }
         mock_page.query_selector = AsyncMock(return_value=None)
 
         tools = StealthSearchTools(mock_page)
         result = await tools.extract("https://docs.example.com/api/auth", max_length=5000)
+        content_lower = result.content.lower()
 
         # Documentation elements should be preserved
-        assert "api key" in result.content.lower()
-        assert "authorization" in result.content.lower() or "bearer" in result.content.lower()
-        assert "rate" in result.content.lower() or "limit" in result.content.lower()
+        assert "api key" in content_lower
+        assert "authorization" in content_lower or "bearer" in content_lower
+        assert "rate" in content_lower or "limit" in content_lower
@@ -3,9 +3,11 @@ Tests for CAPTCHA solver functionality.
 """
 
 import asyncio
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import cv2
 import numpy as np
 import pytest
 
@@ -51,6 +53,33 @@ class TestCaptchaSolver:
         assert detected is True
         assert captcha_type == "cloudflare_turnstile"
 
+    @pytest.mark.asyncio
+    async def test_detect_captcha_probes_selectors_concurrently(self, captcha_solver, mock_page):
+        """Test that selector probes run together and the first hit by priority wins."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def query_selector(selector):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if ".cf-turnstile" in selector:
+                raise Exception("Execution context was destroyed")
+            if ".h-captcha" in selector or ".g-recaptcha" in selector:
+                return MagicMock()
+            return None
+
+        mock_page.query_selector = AsyncMock(side_effect=query_selector)
+
+        detected, captcha_type = await captcha_solver.detect_captcha(mock_page)
+
+        assert detected is True
+        assert captcha_type == "hcaptcha"
+        assert max_in_flight == len(captcha_solver._SELECTOR_PROBES)
+        mock_page.content.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_detect_captcha_hcaptcha_content(self, captcha_solver, mock_page):
         """Test detection of hCaptcha via content analysis."""
@@ -132,6 +161,50 @@ class TestCaptchaSolver:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_match_template_coarse_to_fine(self, captcha_solver):
+        """Test that large templates are located exactly via the pyramid search."""
+        rng = np.random.default_rng(7)
+        screenshot = cv2.GaussianBlur(rng.integers(0, 256, (480, 640), dtype=np.uint8), (5, 5), 0)
+        template = screenshot[301:365, 157:237].copy()
+
+        x, y, window = captcha_solver._coarse_search_window(screenshot, template)
+        assert window.shape[0] < screenshot.shape[0]
+        assert window.shape[1] < screenshot.shape[1]
+
+        result = captcha_solver._match_template(screenshot, template)
+
+        assert result is not None
+        center_x, center_y, confidence = result
+        assert (center_x, center_y) == (157 + 80 // 2, 301 + 64 // 2)
+        assert confidence > 0.99
+
+    @pytest.mark.asyncio
+    async def test_template_click_decodes_screenshot_in_memory(self, captcha_solver, mock_page):
+        """Test that the iframe screenshot bytes are matched without a temp file."""
+        rng = np.random.default_rng(3)
+        screenshot = cv2.GaussianBlur(rng.integers(0, 256, (120, 200), dtype=np.uint8), (3, 3), 0)
+        captcha_solver.templates["hcaptcha_checkbox"] = screenshot[40:70, 60:90].copy()
+        mock_page.screenshot = AsyncMock(return_value=cv2.imencode(".png", screenshot)[1].tobytes())
+        captcha_solver._human_click = AsyncMock()
+
+        box = {"x": 10, "y": 20, "width": 200, "height": 120}
+        clicked = await captcha_solver._template_click(mock_page, box, "hcaptcha_checkbox")
+
+        assert clicked is True
+        assert "path" not in mock_page.screenshot.call_args.kwargs
+        captcha_solver._human_click.assert_awaited_once_with(10 + 75, 20 + 55)
+        assert captcha_solver._decode_screenshot(b"") is None
+
+    @pytest.mark.asyncio
+    async def test_match_template_rejects_constant_images(self, captcha_solver):
+        """Test that a blank screenshot or template never produces a match."""
+        screenshot = np.full((100, 100), 128, dtype=np.uint8)
+        template = np.random.randint(0, 256, (20, 20), dtype=np.uint8)
+
+        assert captcha_solver._match_template(screenshot, template, threshold=0.0) is None
+        assert captcha_solver._match_template(template, screenshot[:10, :10], 0.0) is None
+
     @pytest.mark.asyncio
     async def test_generate_mouse_path(self, captcha_solver):
         """Test mouse path generation."""
@@ -159,6 +232,39 @@ class TestCaptchaSolver:
 
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_wait_for_captcha_resolution_backs_off(self, captcha_solver, mock_page):
+        """Test that checks back off geometrically up to the cap."""
+        detections = [(True, "hcaptcha")] * 5 + [(False, None)]
+        captcha_solver.detect_captcha = AsyncMock(side_effect=detections)
+
+        with patch("src.browser.captcha.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await captcha_solver.wait_for_captcha_resolution(
+                mock_page, check_interval=0.25, timeout=30
+            )
+
+        assert result is True
+        delays = [call.args[0] for call in mock_sleep.await_args_list]
+        assert delays == [0.25, 0.5, 1.0, 1.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_wait_for_captcha_resolution_waits_for_detach(self, captcha_solver, mock_page):
+        """Test that a CAPTCHA element in the DOM is awaited instead of polled."""
+        captcha_solver.detect_captcha = AsyncMock(
+            side_effect=[(True, "cloudflare_turnstile"), (False, None)]
+        )
+        mock_page.query_selector = AsyncMock(return_value=MagicMock())
+        mock_page.wait_for_selector = AsyncMock(return_value=None)
+
+        with patch("src.browser.captcha.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await captcha_solver.wait_for_captcha_resolution(mock_page, timeout=30)
+
+        assert result is True
+        mock_sleep.assert_not_awaited()
+        selector = mock_page.wait_for_selector.await_args.args[0]
+        assert ".cf-turnstile" in selector
+        assert mock_page.wait_for_selector.await_args.kwargs["state"] == "detached"
+
 
 class TestMouseController:
     """Test suite for MouseController class."""
@@ -186,6 +292,45 @@ class TestMouseController:
 
         mock_pg.moveTo.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_drag_to_reuses_default_solver(self, mouse_controller):
+        """Test that drags share the default solver instead of building one each time."""
+        solver = CaptchaSolver(templates_dir="/nonexistent")
+        with (
+            patch("src.browser.captcha.pyautogui_available", True),
+            patch("src.browser.captcha.pyautogui") as mock_pg,
+            patch("src.browser.captcha.asyncio.sleep", new=AsyncMock()),
+            patch("src.browser.captcha._default_solver", solver),
+            patch.object(CaptchaSolver, "__init__", return_value=None) as mock_init,
+        ):
+            mock_pg.position.return_value = (0, 0)
+            await mouse_controller.drag_to(0, 0, 50, 50)
+            await mouse_controller.drag_to(50, 50, 100, 0)
+
+        mock_init.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("src.browser.captcha.pyautogui")
+    async def test_move_to_does_not_block_event_loop(self, mock_pg, mouse_controller):
+        """Test that a blocking pyautogui move leaves the event loop free."""
+        mock_pg.moveTo.side_effect = lambda *args, **kwargs: time.sleep(0.2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            await mouse_controller.move_to(100, 100, duration=0.2)
+        finally:
+            ticker_task.cancel()
+
+        mock_pg.moveTo.assert_called_once()
+        assert ticks > 5
+
     @pytest.mark.asyncio
     @patch("src.browser.captcha.pyautogui")
     async def test_click(self, mock_pg, mouse_controller):
@@ -206,6 +351,20 @@ class TestMouseController:
         # Should call scroll multiple times for natural movement
         assert mock_pg.scroll.call_count >= 1
 
+    @pytest.mark.asyncio
+    @patch("src.browser.captcha.pyautogui")
+    async def test_scroll_uses_few_chunks(self, mock_pg, mouse_controller):
+        """Test that large scrolls are split into at most 5 calls summing to the amount."""
+        for amount in (-1234, -30, 0, 250, 5000):
+            mock_pg.scroll.reset_mock()
+
+            with patch("src.browser.captcha.asyncio.sleep", new_callable=AsyncMock):
+                await mouse_controller.scroll(amount)
+
+            amounts = [call.args[0] for call in mock_pg.scroll.call_args_list]
+            assert 1 <= len(amounts) <= 5
+            assert sum(amounts) == amount
+
 
 class TestConvenienceFunction:
     """Test suite for convenience function."""
@@ -221,6 +380,23 @@ class TestConvenienceFunction:
         assert result["success"] is True
         assert "message" in result
 
+    @pytest.mark.asyncio
+    async def test_solve_captcha_reuses_default_solver(self, mock_page):
+        """Test that solve_captcha loads templates once for the default directory."""
+        mock_page.content = AsyncMock(return_value="<html></html>")
+
+        with (
+            patch("src.browser.captcha._default_solver", None),
+            patch.object(CaptchaSolver, "_load_templates") as mock_load,
+        ):
+            await solve_captcha(mock_page, timeout=1)
+            await solve_captcha(mock_page, timeout=1)
+            assert mock_load.call_count == 1
+
+            # A custom templates directory still gets its own solver
+            await solve_captcha(mock_page, timeout=1, templates_dir="/nonexistent")
+            assert mock_load.call_count == 2
+
 
 @pytest.fixture
 def mock_page():
@@ -308,6 +484,13 @@ class TestCaptchaSelectors:
         assert "captcha" in [i.lower() for i in solver.CHALLENGE_INDICATORS]
         assert "verification" in [i.lower() for i in solver.CHALLENGE_INDICATORS]
 
+    def test_indicator_scan_covers_all_indicators(self):
+        """Test that the reduced content-scan list still finds every indicator."""
+        scan = CaptchaSolver._INDICATOR_SCAN
+        assert len(scan) < len(CaptchaSolver.CHALLENGE_INDICATORS)
+        for indicator in CaptchaSolver.CHALLENGE_INDICATORS:
+            assert any(pattern in indicator.lower() for pattern in scan)
+
     def test_slider_selectors(self):
         """Test slider CAPTCHA selector patterns."""
         solver = CaptchaSolver()
@@ -346,27 +529,35 @@ class TestSliderCaptcha:
         page.mouse.up = AsyncMock()
         return page
 
+    @pytest.fixture
+    def slider_query_selector(self):
+        """Build query_selector side effects that find an element only for slider selectors."""
+        slider_selectors = (
+            'button:has-text("Drag the slider")',
+            'button:has-text("slider")',
+            '[role="button"]:has-text("Drag")',
+            'input[type="range"]',
+            ".slider-captcha",
+            '[class*="slider"]',
+        )
+
+        def factory(element):
+            async def mock_query_selector(selector):
+                if any(slider in selector for slider in slider_selectors):
+                    return element
+                return None
+
+            return mock_query_selector
+
+        return factory
+
     @pytest.mark.asyncio
-    async def test_detect_slider_captcha_button(self, captcha_solver, mock_page):
+    async def test_detect_slider_captcha_button(
+        self, captcha_solver, mock_page, slider_query_selector
+    ):
         """Test detection of slider CAPTCHA via button selector."""
-        # Mock query_selector to return button only for slider selectors
         mock_button = MagicMock()
-        
-        async def mock_query_selector(selector):
-            # Return button for slider-specific selectors
-            slider_selectors = [
-                'button:has-text("Drag the slider")',
-                'button:has-text("slider")',
-                '[role="button"]:has-text("Drag")',
-                'input[type="range"]',
-                '.slider-captcha',
-                '[class*="slider"]',
-            ]
-            if selector in slider_selectors:
-                return mock_button
-            return None
-        
-        mock_page.query_selector = AsyncMock(side_effect=mock_query_selector)
+        mock_page.query_selector = AsyncMock(side_effect=slider_query_selector(mock_button))
 
         detected, captcha_type = await captcha_solver.detect_captcha(mock_page)
 
@@ -388,6 +579,18 @@ class TestSliderCaptcha:
         assert detected is True
         assert captcha_type == "slider"
 
+    @pytest.mark.asyncio
+    async def test_detect_type_name_without_indicator(self, captcha_solver, mock_page):
+        """Test that a bare type name is not a CAPTCHA without a challenge indicator."""
+        mock_page.content = AsyncMock(
+            return_value="<html><div class='image-slider'>Photo gallery</div></html>"
+        )
+
+        detected, captcha_type = await captcha_solver.detect_captcha(mock_page)
+
+        assert detected is False
+        assert captcha_type is None
+
     @pytest.mark.asyncio
     async def test_solve_slider_no_element(self, captcha_solver, mock_page):
         """Test solving slider when element is not found."""
@@ -403,27 +606,15 @@ class TestSliderCaptcha:
         assert result["success"] is False
 
     @pytest.mark.asyncio
-    async def test_solve_slider_no_bounding_box(self, captcha_solver, mock_page):
+    async def test_solve_slider_no_bounding_box(
+        self, captcha_solver, mock_page, slider_query_selector
+    ):
         """Test solving slider when bounding box is not available."""
         # Mock slider button without bounding box
         mock_button = MagicMock()
         mock_button.bounding_box = AsyncMock(return_value=None)
         
-        # Mock query_selector to return button only for slider selectors
-        async def mock_query_selector(selector):
-            slider_selectors = [
-                'button:has-text("Drag the slider")',
-                'button:has-text("slider")',
-                '[role="button"]:has-text("Drag")',
-                'input[type="range"]',
-                '.slider-captcha',
-                '[class*="slider"]',
-            ]
-            if selector in slider_selectors:
-                return mock_button
-            return None
-        
-        mock_page.query_selector = AsyncMock(side_effect=mock_query_selector)
+        mock_page.query_selector = AsyncMock(side_effect=slider_query_selector(mock_button))
 
         result = await captcha_solver.solve(mock_page, timeout=1)
 
@@ -432,7 +623,9 @@ class TestSliderCaptcha:
         assert result["success"] is False
 
     @pytest.mark.asyncio
-    async def test_solve_slider_calls_drag_operation(self, captcha_solver, mock_page):
+    async def test_solve_slider_calls_drag_operation(
+        self, captcha_solver, mock_page, slider_query_selector
+    ):
         """Test that slider solving attempts drag operation."""
         # Mock slider button with bounding box
         mock_button = MagicMock()
@@ -441,21 +634,7 @@ class TestSliderCaptcha:
         )
         mock_button.hover = AsyncMock()
         
-        # Mock query_selector to return button only for slider selectors
-        async def mock_query_selector(selector):
-            slider_selectors = [
-                'button:has-text("Drag the slider")',
-                'button:has-text("slider")',
-                '[role="button"]:has-text("Drag")',
-                'input[type="range"]',
-                '.slider-captcha',
-                '[class*="slider"]',
-            ]
-            if selector in slider_selectors:
-                return mock_button
-            return None
-        
-        mock_page.query_selector = AsyncMock(side_effect=mock_query_selector)
+        mock_page.query_selector = AsyncMock(side_effect=slider_query_selector(mock_button))
         
         # Mock detect_captcha to return False after drag (simulate success)
         detect_count = [0]
@@ -476,7 +655,9 @@ class TestSliderCaptcha:
         assert "duration" in result
 
     @pytest.mark.asyncio
-    async def test_solve_slider_with_playwright_fallback(self, captcha_solver, mock_page):
+    async def test_solve_slider_with_playwright_fallback(
+        self, captcha_solver, mock_page, slider_query_selector
+    ):
         """Test slider solving uses Playwright mouse when pyautogui unavailable."""
         # Mock slider button
         mock_button = MagicMock()
@@ -485,21 +666,7 @@ class TestSliderCaptcha:
         )
         mock_button.hover = AsyncMock()
         
-        # Mock query_selector to return button only for slider selectors
-        async def mock_query_selector(selector):
-            slider_selectors = [
-                'button:has-text("Drag the slider")',
-                'button:has-text("slider")',
-                '[role="button"]:has-text("Drag")',
-                'input[type="range"]',
-                '.slider-captcha',
-                '[class*="slider"]',
-            ]
-            if selector in slider_selectors:
-                return mock_button
-            return None
-        
-        mock_page.query_selector = AsyncMock(side_effect=mock_query_selector)
+        mock_page.query_selector = AsyncMock(side_effect=slider_query_selector(mock_button))
         
         # Mock mouse methods
         mock_page.mouse.down = AsyncMock()
@@ -1,22 +1,10 @@
 """Unit tests for new Stealth Browser MCP features and validation."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from src.server import StealthBrowserServer
+from unittest.mock import AsyncMock, patch
 from mcp.types import TextContent
 
 
-@pytest.fixture
-def server():
-    """Create a server instance with mocked components."""
-    with patch("src.server.BrowserManager"):
-        server = StealthBrowserServer()
-        server.browser_manager = MagicMock()
-        server.browser_manager.page = AsyncMock()
-        server.browser_manager.subagent_manager = None
-        return server
-
-
 @pytest.mark.asyncio
 async def test_stealth_scrape_routing_isolated(server):
     """Verify stealth_scrape tool calls the correct internal method."""
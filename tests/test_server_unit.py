@@ -2,69 +2,61 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from mcp.types import ListToolsRequest, TextContent
 from src.server import StealthBrowserServer
-from mcp.types import TextContent
-
-
-@pytest.fixture
-def server():
-    """Create a server instance with mocked components."""
-    with patch("src.server.BrowserManager"):
-        server = StealthBrowserServer()
-        server.browser_manager = MagicMock()
-        server.browser_manager.page = AsyncMock()
-        return server
-
-
-@pytest.mark.asyncio
-async def test_execute_tool_browser_navigate(server):
-    """Test browser_navigate routing."""
-    result = await server._execute_tool("browser_navigate", {"url": "https://example.com"})
-    server.browser_manager.page.goto.assert_called_once_with(
-        "https://example.com", wait_until="load"
-    )
-    assert "Navigated to https://example.com" in result
-
-
-@pytest.mark.asyncio
-async def test_execute_tool_browser_back(server):
-    """Test browser_back routing."""
-    result = await server._execute_tool("browser_back", {})
-    server.browser_manager.page.go_back.assert_called_once()
-    assert "Navigated back" in result
 
 
 @pytest.mark.asyncio
-async def test_execute_tool_browser_click(server):
-    """Test browser_click routing."""
-    result = await server._execute_tool("browser_click", {"selector": "button"})
-    server.browser_manager.page.click.assert_called_once_with("button")
-    assert "Clicked element: button" in result
+async def test_every_listed_tool_has_a_route(server):
+    """Test that the advertised tools match the tools call_tool_handler can dispatch."""
+    list_tools = server.server.request_handlers[ListToolsRequest]
+    result = await list_tools(ListToolsRequest(method="tools/list"))
 
-
-@pytest.mark.asyncio
-async def test_execute_tool_browser_fill(server):
-    """Test browser_fill routing."""
-    result = await server._execute_tool("browser_fill", {"selector": "input", "value": "test"})
-    server.browser_manager.page.fill.assert_called_once_with("input", "test")
-    assert "Filled input with value" in result
+    listed = {tool.name for tool in result.root.tools}
+    routed = set(StealthBrowserServer._TOOL_HANDLERS) | StealthBrowserServer._ISOLATED_TOOLS
+    assert listed == routed
 
 
 @pytest.mark.asyncio
-async def test_execute_tool_browser_hover(server):
-    """Test browser_hover routing."""
-    result = await server._execute_tool("browser_hover", {"selector": "div"})
-    server.browser_manager.page.hover.assert_called_once_with("div")
-    assert "Hovered over div" in result
+@pytest.mark.parametrize(
+    "tool, arguments, method, call_args, expected",
+    [
+        (
+            "browser_navigate",
+            {"url": "https://example.com"},
+            "goto",
+            (("https://example.com",), {"wait_until": "load"}),
+            "Navigated to https://example.com",
+        ),
+        ("browser_back", {}, "go_back", ((), {}), "Navigated back"),
+        (
+            "browser_click",
+            {"selector": "button"},
+            "click",
+            (("button",), {}),
+            "Clicked element: button",
+        ),
+        (
+            "browser_fill",
+            {"selector": "input", "value": "test"},
+            "fill",
+            (("input", "test"), {}),
+            "Filled input with value",
+        ),
+        ("browser_hover", {"selector": "div"}, "hover", (("div",), {}), "Hovered over div"),
+        ("browser_evaluate", {"script": "1+1"}, "evaluate", (("1+1",), {}), "evaluated"),
+    ],
+    ids=["navigate", "back", "click", "fill", "hover", "evaluate"],
+)
+async def test_execute_tool_page_routing(server, tool, arguments, method, call_args, expected):
+    """Test that simple page tools call the matching page method once."""
+    server.browser_manager.page.evaluate.return_value = "evaluated"
 
+    result = await server._execute_tool(tool, arguments)
 
-@pytest.mark.asyncio
-async def test_execute_tool_browser_evaluate(server):
-    """Test browser_evaluate routing."""
-    server.browser_manager.page.evaluate.return_value = "evaluated"
-    result = await server._execute_tool("browser_evaluate", {"script": "1+1"})
-    server.browser_manager.page.evaluate.assert_called_once_with("1+1")
-    assert result == "evaluated"
+    args, kwargs = call_args
+    getattr(server.browser_manager.page, method).assert_called_once_with(*args, **kwargs)
+    assert expected in result
 
 
 @pytest.mark.asyncio
@@ -109,6 +101,16 @@ async def test_execute_tool_stealth_search(server):
         assert "URL: U1" in result
 
 
+@pytest.mark.asyncio
+async def test_execute_tool_stealth_search_validates_before_context(server):
+    """Test that invalid search input is rejected before any browser context is opened."""
+    with pytest.raises(ValueError, match="Query cannot be empty"):
+        await server._execute_tool_isolated("stealth_search", {"query": "  "})
+
+    server.browser_manager.isolated_context.assert_not_called()
+    server.browser_manager.get_subagent_browser.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_execute_tool_stealth_extract(server):
     """Test stealth_extract routing."""
@@ -125,16 +127,45 @@ async def test_execute_tool_stealth_extract(server):
         server.browser_manager.isolated_context.return_value.__aenter__.return_value = mock_page
 
         result = await server._execute_tool_isolated("stealth_extract", {"url": "https://test.com"})
-        mock_instance.extract.assert_called_once_with(url="https://test.com", max_length=5000)
+        mock_instance.extract.assert_called_once_with(
+            url="https://test.com", max_length=5000, use_cache=True
+        )
         assert "Title: Title" in result
         assert "Summary:\nSummary" in result
         assert "Content:\nContent" in result
 
 
+@pytest.mark.asyncio
+async def test_execute_tool_stealth_extract_many(server):
+    """Test stealth_extract_many routing and per-URL formatting."""
+    with patch("src.server.StealthSearchTools") as MockTools:
+        mock_instance = MockTools.return_value
+        mock_instance.extract_many = AsyncMock(
+            return_value=[
+                MagicMock(
+                    title="First", url="https://a.com", content="A", word_count=1, summary=""
+                ),
+                None,
+            ]
+        )
+
+        mock_page = AsyncMock()
+        server.browser_manager.isolated_context.return_value.__aenter__.return_value = mock_page
+
+        result = await server._execute_tool_isolated(
+            "stealth_extract_many", {"urls": ["https://a.com", "https://b.com"], "concurrency": 2}
+        )
+        mock_instance.extract_many.assert_called_once_with(
+            urls=["https://a.com", "https://b.com"], max_length=5000, concurrency=2
+        )
+        assert "Title: First" in result
+        assert "URL: https://b.com\nError: Failed to extract content" in result
+
+
 @pytest.mark.asyncio
 async def test_execute_tool_captcha(server):
     """Test browser_solve_captcha routing."""
-    with patch("src.server.CaptchaSolver") as MockSolver:
+    with patch("src.browser.captcha.CaptchaSolver") as MockSolver:
         mock_instance = MockSolver.return_value
         mock_instance.solve = AsyncMock(return_value={"success": True, "duration": 1.5})
 
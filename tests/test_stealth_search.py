@@ -9,23 +9,30 @@ from src.tools.stealth_search import (
 )
 
 
+@pytest.fixture(scope="module")
+def mock_page():
+    """Create a mock Playwright page shared by the module (reset before each test)."""
+    page = AsyncMock()
+    page.goto = AsyncMock()
+    page.wait_for_selector = AsyncMock()
+    page.wait_for_timeout = AsyncMock()
+    page.evaluate = AsyncMock()
+    return page
+
+
+@pytest.fixture(scope="module")
+def search_tools(mock_page):
+    """Create a StealthSearchTools instance."""
+    return StealthSearchTools(mock_page)
+
+
 class TestValidationErrors:
     """Test suite for input validation in StealthSearchTools."""
 
-    @pytest.fixture
-    def mock_page(self):
-        """Create a mock Playwright page."""
-        page = AsyncMock()
-        page.goto = AsyncMock()
-        page.wait_for_selector = AsyncMock()
-        page.wait_for_timeout = AsyncMock()
-        page.evaluate = AsyncMock()
-        return page
-
-    @pytest.fixture
-    def search_tools(self, mock_page):
-        """Create a StealthSearchTools instance."""
-        return StealthSearchTools(mock_page)
+    @pytest.fixture(autouse=True)
+    def reset_mock_page(self, mock_page):
+        """Reset the shared mock page so each test starts from a clean state."""
+        mock_page.reset_mock(return_value=True, side_effect=True)
 
     @pytest.mark.asyncio
     async def test_search_empty_query_raises_error(self, search_tools, mock_page):